@@ -33,6 +33,19 @@ __all__ = [
 ]
 
 
+_API_KEY_PREFIX = "gf_sk_"
+
+_ERR_MISSING_KEY = (
+    "ERROR: GRAFOREST_API_KEY environment variable not set\n"
+    "\n"
+    "Get your API key from: https://graforest.ai/settings\n"
+    "\n"
+    "Then set it:\n"
+    "  export GRAFOREST_API_KEY=gf_sk_your_key_here\n"
+)
+_ERR_INVALID_KEY = f"ERROR: Invalid API key format. Must start with '{_API_KEY_PREFIX}'\n"
+
+
 def _validate_api_key(api_key: str | None, transport: str) -> str | None:
     """Validate API key for the given transport.
     HTTP mode: API key provided per-request (returns None).
@@ -41,20 +54,11 @@ def _validate_api_key(api_key: str | None, transport: str) -> str | None:
     if transport == "http":
         return None
 
-    if not api_key:
-        print("ERROR: GRAFOREST_API_KEY environment variable not set", file=sys.stderr)
-        print("", file=sys.stderr)
-        print("Get your API key from: https://graforest.ai/settings", file=sys.stderr)
-        print("", file=sys.stderr)
-        print("Then set it:", file=sys.stderr)
-        print("  export GRAFOREST_API_KEY=gf_sk_your_key_here", file=sys.stderr)
-        sys.exit(1)
-
-    if not api_key.startswith("gf_sk_"):
-        print("ERROR: Invalid API key format. Must start with 'gf_sk_'", file=sys.stderr)
-        sys.exit(1)
+    if api_key and api_key.startswith(_API_KEY_PREFIX):
+        return api_key
 
-    return api_key
+    sys.stderr.write(_ERR_INVALID_KEY if api_key else _ERR_MISSING_KEY)
+    sys.exit(1)
 
 
 def main() -> None:
@@ -8,18 +8,35 @@
 #   RBClient             — HTTP client for RationalBloks (infra provisioning)
 #   GraforestMCPServer   — Full MCP server with 13 knowledge graph tools
 #   create_graforest_server — Factory function
-#   GRAFOREST_TOOLS      — Tool definitions list
-#   GRAFOREST_PROMPTS    — Prompt definitions list
+#   GRAFOREST_TOOLS      — Tool definitions (tuple)
+#   GRAFOREST_PROMPTS    — Prompt definitions (tuple)
+#
+# Exports are resolved lazily (PEP 562) so importing the package doesn't
+# pull in httpx / the MCP framework until something is actually used.
 # ============================================================================
 
-from .graph_client import GraphClient
-from .rb_client import RBClient, KNOWLEDGE_GRAPH_SCHEMA
-from .tools import (
-    GRAFOREST_TOOLS,
-    GRAFOREST_PROMPTS,
-    GraforestMCPServer,
-    create_graforest_server,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .graph_client import GraphClient
+    from .rb_client import RBClient, KNOWLEDGE_GRAPH_SCHEMA
+    from .tools import (
+        GRAFOREST_TOOLS,
+        GRAFOREST_PROMPTS,
+        GraforestMCPServer,
+        create_graforest_server,
+    )
+
+_LAZY_EXPORTS = {
+    "GraphClient": ".graph_client",
+    "RBClient": ".rb_client",
+    "KNOWLEDGE_GRAPH_SCHEMA": ".rb_client",
+    "GRAFOREST_TOOLS": ".tools",
+    "GRAFOREST_PROMPTS": ".tools",
+    "GraforestMCPServer": ".tools",
+    "create_graforest_server": ".tools",
+}
 
 __all__ = [
     "GraphClient",
@@ -30,3 +47,12 @@ __all__ = [
     "GraforestMCPServer",
     "create_graforest_server",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # cache — later lookups skip __getattr__
+    return value
@@ -14,21 +14,222 @@
 #     - rel_id → id, rel_type → type
 # ============================================================================
 
+import asyncio
+import contextlib
+import functools
+import importlib.util
+import json
 import logging
+import os
+import random
+import re
+import time
+from collections.abc import Callable, Coroutine, Iterable, Iterator, Mapping
+from types import MappingProxyType
 from typing import Any
 
 import httpx
 
+# Optional C JSON encoder for bulk write bodies — stdlib json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # Graph API URL patterns
 GRAPH_API_STAGING_PATTERN = "https://{project_code}-staging.rationalbloks.com"
 GRAPH_API_PRODUCTION_PATTERN = "https://{project_code}.rationalbloks.com"
 
-# Bulk operation batch size
-MAX_BULK_SIZE = 500
+# Bulk operation batch size — starting point, auto-tuned per client from
+# observed batch latency and clamped to BULK_SIZE_BOUNDS
+DEFAULT_BULK_SIZE = int(os.environ.get("GRAFOREST_BULK_SIZE", "2000"))
+BULK_SIZE_BOUNDS = (100, 20_000)
+
+# Max bulk batches in flight at once (across all types). The effective limit
+# adapts to backpressure (AIMD): halved after 3 consecutive 429s, +1 after
+# every 20 consecutive successes, never above this ceiling.
+MAX_INFLIGHT = int(os.environ.get("GRAFOREST_MAX_INFLIGHT", "16"))
+
+# Send bulk batches column-oriented ({entity_ids: [...], data: [...]}) when the
+# Graph API accepts ?format=columnar; falls back to row format on 415, or on a
+# 400 that names the columnar format (other 400s are data errors)
+BULK_COLUMNAR = os.environ.get("GRAFOREST_BULK_COLUMNAR", "") == "1"
+
+# Schemas change rarely; cache them per (project, environment, token)
+SCHEMA_CACHE_TTL = float(os.environ.get("GRAFOREST_SCHEMA_TTL", "300"))
+SCHEMA_CACHE_SIZE = 256
+
+# Upper bound on nodes kept from one traversal response
+MAX_TRAVERSE_NODES = 5000
+
+# Transient statuses retried with exponential backoff on bulk writes
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+MAX_RETRY_DELAY = 30.0
+
+# Connection pool shared by every Graph API / RationalBloks call.
+# HTTP/2 multiplexing is used when the optional `h2` package is installed.
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=100,
+    keepalive_expiry=30.0,
+)
+# Pool default — GraphClient passes its own timeout on every request
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# Relationship fields that are lifted out of the properties dict
+_REL_SKIP = frozenset({"rel_id", "from_id", "to_id", "rel_type", "from_path", "to_path"})
+
+# Entity / relationship type names are interpolated into bulk endpoint paths
+# as one path segment, so only characters that would break out of it are refused
+_UNSAFE_TYPE_NAME = re.compile(r"[/?#\s]")
+
+__all__ = ["GraphClient", "close_shared_client", "get_shared_client", "prewarm_graph_api"]
+
+_shared_client: httpx.AsyncClient | None = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Process-wide client so keepalive connections are reused across calls.
+
+    Closed only at process shutdown (close_shared_client); callers that need
+    a different timeout pass it per request.
+    """
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            timeout=HTTP_TIMEOUT,
+            limits=HTTP_LIMITS,
+        )
+    return _shared_client
+
+
+def _check_type_names(names: Iterable[str], kind: str) -> None:
+    """Reject type names that can't be sent as a URL path segment."""
+    bad = sorted(
+        n for n in names
+        if n in ("", ".", "..") or _UNSAFE_TYPE_NAME.search(n)
+    )
+    if bad:
+        raise ValueError(f"Invalid {kind}: {', '.join(map(repr, bad))}")
+
+
+def _chunks(items: list[Any], size: int) -> Iterator[list[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _discard(task: asyncio.Task) -> None:
+    """Cancel a task whose result is no longer wanted.
+
+    cancel() doesn't stop a task that has already finished, and a task can
+    still end with its own error while unwinding from the cancel — retrieve
+    that exception too, or asyncio logs "Task exception was never retrieved".
+    """
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+def _encode_body(payload: dict[str, Any]) -> bytes:
+    """Compact JSON bytes for a bulk batch."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits — let stdlib json handle it
+    return json.dumps(payload, separators=(",", ":")).encode()
+
 
-__all__ = ["GraphClient"]
+@functools.lru_cache(maxsize=256)
+def _resolve_url_cached(project_code: str, environment: str) -> str:
+    code = project_code.lower().replace("_", "-")
+    if environment == "production":
+        return GRAPH_API_PRODUCTION_PATTERN.format(project_code=code)
+    return GRAPH_API_STAGING_PATTERN.format(project_code=code)
+
+
+@functools.lru_cache(maxsize=32)
+def _auth_headers(token: str) -> Mapping[str, str]:
+    # Read-only so the cached mapping can't be mutated by a caller
+    return MappingProxyType({"Authorization": f"Bearer {token}"})
+
+
+@functools.lru_cache(maxsize=32)
+def _json_auth_headers(token: str) -> Mapping[str, str]:
+    return MappingProxyType({
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+    })
+
+
+async def close_shared_client() -> None:
+    """Close the shared connection pool (call on shutdown)."""
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+
+
+async def prewarm_graph_api(
+    project_code: str,
+    environment: str = "staging",
+    interval: float = 2.0,
+    max_wait: float = 300.0,
+) -> bool:
+    """Open a pooled connection to a (still deploying) Graph API ahead of use.
+
+    Polls /health until it answers 200 so TLS is already negotiated when the
+    first data call arrives. Errors are expected while the API comes up.
+    """
+    client = get_shared_client()
+    url = f"{_resolve_url_cached(project_code, environment)}/health"
+    deadline = time.monotonic() + max_wait
+    while time.monotonic() < deadline:
+        with contextlib.suppress(httpx.HTTPError):
+            resp = await client.get(url)
+            if resp.status_code == 200:
+                return True
+        await asyncio.sleep(interval)
+    return False
+
+
+class _AdaptiveLimiter:
+    """Concurrency cap whose limit shrinks/grows with server backpressure."""
+
+    def __init__(self, limit: int, floor: int = 2) -> None:
+        self.max_limit = limit
+        self.limit = limit
+        self._floor = min(floor, limit)
+        self._in_use = 0
+        self._throttled = 0
+        self._succeeded = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_use < self.limit)
+            self._in_use += 1
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        async with self._cond:
+            self._in_use -= 1
+            self._cond.notify_all()
+
+    def record(self, status_code: int) -> None:
+        if status_code == 429:
+            self._succeeded = 0
+            self._throttled += 1
+            if self._throttled >= 3:
+                self._throttled = 0
+                self.limit = max(self._floor, self.limit // 2)
+                logger.info(f"Graph API throttling — bulk concurrency now {self.limit}")
+        elif status_code < 400:
+            self._throttled = 0
+            self._succeeded += 1
+            if self._succeeded >= 20:
+                self._succeeded = 0
+                self.limit = min(self.max_limit, self.limit + 1)
 
 
 class GraphClient:
@@ -38,41 +239,86 @@ class GraphClient:
     to authenticate against Graph API endpoints.
     """
 
-    def __init__(self, timeout: float = 60.0):
+    def __init__(
+        self,
+        timeout: float = 60.0,
+        max_inflight: int = MAX_INFLIGHT,
+        max_retries: int = 5,
+        retry_statuses: frozenset[int] = RETRY_STATUSES,
+        columnar: bool = BULK_COLUMNAR,
+        http_client: httpx.AsyncClient | None = None,
+    ):
         self.timeout = timeout
-        self._client: httpx.AsyncClient | None = None
+        self._http_client = http_client  # injected client; shared pool when None
+        # Sent with every request — an injected client keeps its own setting
+        self._timeout: httpx.Timeout | Any = (
+            httpx.Timeout(timeout, connect=10.0)
+            if http_client is None
+            else httpx.USE_CLIENT_DEFAULT
+        )
+        self.columnar = columnar
+        self.max_retries = max_retries
+        self.retry_statuses = retry_statuses
+        self._inflight = _AdaptiveLimiter(max_inflight)
+        self._bulk_size = DEFAULT_BULK_SIZE
+        self._batch_latency: float | None = None  # EMA of batch wall time (s)
+        # (project_code, environment, token) -> (expires_at, schema)
+        self._schema_cache: dict[tuple[str, str, str], tuple[float, dict[str, Any]]] = {}
 
     async def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=self.timeout)
-        return self._client
+        if self._http_client is not None:
+            return self._http_client
+        return get_shared_client()
 
     async def close(self) -> None:
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
+        """No-op, kept for API compatibility.
+
+        The shared pool outlives any one GraphClient (fetch_url_content and
+        prewarm_graph_api use it too) and is closed by close_shared_client()
+        at process shutdown; an injected client belongs to the caller.
+        """
 
     @staticmethod
     def _resolve_url(project_code: str, environment: str = "staging") -> str:
-        code = project_code.lower().replace("_", "-")
-        if environment == "production":
-            return GRAPH_API_PRODUCTION_PATTERN.format(project_code=code)
-        return GRAPH_API_STAGING_PATTERN.format(project_code=code)
+        return _resolve_url_cached(project_code, environment)
 
-    def _headers(self, token: str) -> dict[str, str]:
-        return {"Authorization": f"Bearer {token}"}
+    def _headers(self, token: str) -> Mapping[str, str]:
+        return _auth_headers(token)
 
     # ====================================================================
     # SCHEMA & STATISTICS
     # ====================================================================
 
     async def get_schema(
-        self, project_code: str, environment: str, token: str,
+        self, project_code: str, environment: str, token: str, refresh: bool = False,
     ) -> dict[str, Any]:
+        """Get the graph schema, served from a TTL cache unless refresh is set."""
+        key = (project_code, environment, token)
+        now = time.monotonic()
+        if not refresh:
+            cached = self._schema_cache.get(key)
+            if cached and cached[0] > now:
+                return cached[1]
+
         client = await self._get_client()
         base = self._resolve_url(project_code, environment)
-        resp = await client.get(f"{base}/schema", headers=self._headers(token))
+        resp = await client.get(
+            f"{base}/schema", headers=self._headers(token), timeout=self._timeout,
+        )
         resp.raise_for_status()
-        return resp.json()
+        schema = resp.json()
+
+        if len(self._schema_cache) >= SCHEMA_CACHE_SIZE:
+            self._schema_cache = {
+                k: v for k, v in self._schema_cache.items() if v[0] > now
+            }
+            if len(self._schema_cache) >= SCHEMA_CACHE_SIZE:
+                del self._schema_cache[next(iter(self._schema_cache))]
+        self._schema_cache[key] = (now + SCHEMA_CACHE_TTL, schema)
+        return schema
+
+    def clear_schema_cache(self) -> None:
+        self._schema_cache.clear()
 
     async def get_statistics(
         self, project_code: str, environment: str, token: str,
@@ -80,7 +326,7 @@ class GraphClient:
         client = await self._get_client()
         base = self._resolve_url(project_code, environment)
         resp = await client.get(
-            f"{base}/api/v1/data/stats", headers=self._headers(token),
+            f"{base}/api/v1/data/stats", headers=self._headers(token), timeout=self._timeout,
         )
         resp.raise_for_status()
         return resp.json()
@@ -99,6 +345,7 @@ class GraphClient:
             f"{base}/api/v1/data/search/text",
             json={"query": query},
             headers=self._headers(token),
+            timeout=self._timeout,
         )
         resp.raise_for_status()
         data = resp.json()
@@ -119,48 +366,76 @@ class GraphClient:
         max_depth: int = 3,
         direction: str = "both",
     ) -> dict[str, Any]:
-        """Traverse graph. Returns normalized {nodes, relationships, depth}."""
+        """Traverse graph. Returns normalized {nodes, relationships, depth, truncated}."""
         client = await self._get_client()
         base = self._resolve_url(project_code, environment)
         headers = self._headers(token)
 
-        resp = await client.post(
-            f"{base}/api/v1/data/traverse",
-            json={
-                "start_entity_type": start_entity_type.lower(),
-                "start_entity_id": start_entity_id,
-                "max_depth": max_depth,
-                "direction": direction,
-            },
+        # Traversal and the starting node's relationships are independent —
+        # start the relationships fetch now, drop it if the traversal is empty
+        rels_task = asyncio.create_task(client.get(
+            f"{base}/api/v1/nodes/{start_entity_type.lower()}/{start_entity_id}/relationships",
+            params={"direction": direction, "limit": 500},
             headers=headers,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-
-        nodes = [self._normalize_node(n) for n in data.get("connected_nodes", [])]
-
-        # Also fetch relationships for the starting node
-        relationships: list[dict[str, Any]] = []
+            timeout=self._timeout,
+        ))
         try:
-            rels_resp = await client.get(
-                f"{base}/api/v1/nodes/{start_entity_type.lower()}/{start_entity_id}/relationships",
-                params={"direction": direction, "limit": 500},
+            resp = await client.post(
+                f"{base}/api/v1/data/traverse",
+                json={
+                    "start_entity_type": start_entity_type.lower(),
+                    "start_entity_id": start_entity_id,
+                    "max_depth": max_depth,
+                    "direction": direction,
+                },
                 headers=headers,
+                timeout=self._timeout,
             )
+            resp.raise_for_status()
+            data = resp.json()
+        except BaseException:
+            _discard(rels_task)
+            raise
+
+        # Dedupe nodes reached by several paths and bound what we hold
+        node_ids: set[str] = set()
+        nodes: list[dict[str, Any]] = []
+        truncated = False
+        for raw in data.get("connected_nodes", []):
+            node = self._normalize_node(raw)
+            if node["id"] in node_ids:
+                continue
+            if len(nodes) >= MAX_TRAVERSE_NODES:
+                truncated = True
+                break
+            node_ids.add(node["id"])
+            nodes.append(node)
+        depth = data.get("max_depth", max_depth)
+        if not nodes:
+            _discard(rels_task)
+            return {"nodes": [], "relationships": [], "depth": depth, "truncated": False}
+
+        # Relationships are best-effort — keep only those within the traversal
+        relationships: list[dict[str, Any]] = []
+        try:
+            rels_resp = await rels_task
             if rels_resp.status_code == 200:
-                node_ids = {n["id"] for n in nodes}
                 node_ids.add(start_entity_id)
-                for r in rels_resp.json():
-                    rel = self._normalize_relationship(r)
-                    if rel["from_id"] in node_ids and rel["to_id"] in node_ids:
-                        relationships.append(rel)
+                contains = node_ids.__contains__
+                relationships = [
+                    rel
+                    for r in rels_resp.json()
+                    if contains((rel := self._normalize_relationship(r))["from_id"])
+                    and contains(rel["to_id"])
+                ]
         except Exception as e:
             logger.debug(f"Could not fetch relationships for traverse: {e}")
 
         return {
             "nodes": nodes,
             "relationships": relationships,
-            "depth": data.get("max_depth", max_depth),
+            "depth": depth,
+            "truncated": truncated,
         }
 
     async def list_entities(
@@ -173,12 +448,15 @@ class GraphClient:
         offset: int = 0,
     ) -> list[dict[str, Any]]:
         """List entities. Normalizes via _normalize_node for consistency."""
+        if limit <= 0:
+            return []
         client = await self._get_client()
         base = self._resolve_url(project_code, environment)
         resp = await client.get(
             f"{base}/api/v1/nodes/{entity_type.lower()}/",
             params={"limit": limit, "offset": offset},
             headers=self._headers(token),
+            timeout=self._timeout,
         )
         resp.raise_for_status()
         return [self._normalize_node(item) for item in resp.json()]
@@ -197,6 +475,7 @@ class GraphClient:
         resp = await client.get(
             f"{base}/api/v1/nodes/{entity_type.lower()}/{entity_id}",
             headers=self._headers(token),
+            timeout=self._timeout,
         )
         resp.raise_for_status()
         return self._normalize_node(resp.json())
@@ -217,6 +496,7 @@ class GraphClient:
             f"{base}/api/v1/relationships/{relationship_type.lower()}/",
             params={"limit": limit, "offset": offset},
             headers=self._headers(token),
+            timeout=self._timeout,
         )
         resp.raise_for_status()
         return [self._normalize_relationship(r) for r in resp.json()]
@@ -231,44 +511,54 @@ class GraphClient:
         environment: str,
         token: str,
         entities: list[dict[str, Any]],
+        bulk_size: int | None = None,
     ) -> dict[str, int]:
-        """Bulk create entities. Returns {entity_type: count}."""
+        """Bulk create entities. Returns {entity_type: count}.
+
+        bulk_size overrides the auto-tuned batch size for this call.
+        """
+        if not entities:
+            return {}
+        size = bulk_size or self._bulk_size
         client = await self._get_client()
         base = self._resolve_url(project_code, environment)
-        headers = self._headers(token)
+        headers = _json_auth_headers(token)
 
-        # Group by type
-        by_type: dict[str, list[dict[str, Any]]] = {}
+        # Deduplicate by (type, id) — last write wins — then group by type
+        dedup: dict[tuple[str, str], dict[str, Any]] = {}
         for e in entities:
-            by_type.setdefault(e["entity_type"], []).append(e)
+            dedup[(e["entity_type"], e["entity_id"])] = e
+        if len(dedup) < len(entities):
+            logger.debug(
+                f"Deduplicated entities {len(entities)} -> {len(dedup)} "
+                f"({1 - len(dedup) / len(entities):.0%} duplicates)"
+            )
 
-        results: dict[str, int] = {}
-        for entity_type, type_entities in by_type.items():
-            api_type = entity_type.lower()
-            created = 0
-
-            for i in range(0, len(type_entities), MAX_BULK_SIZE):
-                batch = type_entities[i : i + MAX_BULK_SIZE]
-                payload = {
-                    "nodes": [
-                        {"entity_id": e["entity_id"], "data": e.get("properties", {})}
-                        for e in batch
-                    ]
-                }
-                resp = await client.post(
-                    f"{base}/api/v1/data/bulk/nodes/{api_type}",
-                    json=payload,
-                    headers=headers,
-                )
-                if resp.status_code not in (200, 201):
-                    raise RuntimeError(
-                        f"Bulk create {entity_type} failed: "
-                        f"{resp.status_code} — {resp.text[:200]}"
-                    )
-                created += resp.json().get("created", len(batch))
+        by_type: dict[str, list[dict[str, Any]]] = {}
+        for e in dedup.values():
+            by_type.setdefault(e["entity_type"], []).append(e)
+        _check_type_names(by_type, "entity_type")
+
+        # Endpoint built once per type, not once per batch
+        urls = {t: f"{base}/api/v1/data/bulk/nodes/{t.lower()}" for t in by_type}
+
+        # Fan out over types AND batches — bounded by the in-flight semaphore
+        results = await self._gather_batches([
+            self._post_batch(
+                client,
+                urls[entity_type],
+                headers,
+                entity_type,
+                batch,
+                self._nodes_payload,
+                self._nodes_columns,
+            )
+            for entity_type, type_entities in by_type.items()
+            for batch in _chunks(type_entities, size)
+        ])
 
-            results[entity_type] = created
-            logger.info(f"Created {created}/{len(type_entities)} {entity_type} entities")
+        for entity_type, created in results.items():
+            logger.info(f"Created {created}/{len(by_type[entity_type])} {entity_type} entities")
 
         return results
 
@@ -278,49 +568,210 @@ class GraphClient:
         environment: str,
         token: str,
         relationships: list[dict[str, Any]],
+        bulk_size: int | None = None,
     ) -> dict[str, int]:
-        """Bulk create relationships. Returns {rel_type: count}."""
+        """Bulk create relationships. Returns {rel_type: count}.
+
+        bulk_size overrides the auto-tuned batch size for this call.
+        """
+        if not relationships:
+            return {}
+        size = bulk_size or self._bulk_size
         client = await self._get_client()
         base = self._resolve_url(project_code, environment)
-        headers = self._headers(token)
+        headers = _json_auth_headers(token)
 
-        by_type: dict[str, list[dict[str, Any]]] = {}
+        dedup: dict[tuple[str, str, str], dict[str, Any]] = {}
         for r in relationships:
+            dedup[(r["rel_type"], r["from_id"], r["to_id"])] = r
+        if len(dedup) < len(relationships):
+            logger.debug(
+                f"Deduplicated relationships {len(relationships)} -> {len(dedup)} "
+                f"({1 - len(dedup) / len(relationships):.0%} duplicates)"
+            )
+
+        by_type: dict[str, list[dict[str, Any]]] = {}
+        for r in dedup.values():
             by_type.setdefault(r["rel_type"], []).append(r)
+        # One batch stream per rel_type, never one request per edge
+        _check_type_names(by_type, "rel_type")
+
+        urls = {t: f"{base}/api/v1/data/bulk/relationships/{t.lower()}" for t in by_type}
+
+        results = await self._gather_batches([
+            self._post_batch(
+                client,
+                urls[rel_type],
+                headers,
+                rel_type,
+                batch,
+                self._rels_payload,
+                self._rels_columns,
+            )
+            for rel_type, type_rels in by_type.items()
+            for batch in _chunks(type_rels, size)
+        ])
+
+        for rel_type, created in results.items():
+            logger.info(f"Created {created}/{len(by_type[rel_type])} {rel_type} relationships")
+
+        return results
+
+    @staticmethod
+    def _nodes_payload(batch: list[dict[str, Any]]) -> dict[str, Any]:
+        return {
+            "nodes": [
+                {"entity_id": e["entity_id"], "data": e.get("properties", {})}
+                for e in batch
+            ]
+        }
+
+    @staticmethod
+    def _rels_payload(batch: list[dict[str, Any]]) -> dict[str, Any]:
+        rows = []
+        for r in batch:
+            row = {"from_id": r["from_id"], "to_id": r["to_id"]}
+            if r.get("properties"):
+                row["data"] = r["properties"]
+            rows.append(row)
+        return {"relationships": rows}
+
+    @staticmethod
+    def _nodes_columns(batch: list[dict[str, Any]]) -> dict[str, Any]:
+        return {
+            "entity_ids": [e["entity_id"] for e in batch],
+            "data": [e.get("properties", {}) for e in batch],
+        }
+
+    @staticmethod
+    def _rels_columns(batch: list[dict[str, Any]]) -> dict[str, Any]:
+        return {
+            "from_ids": [r["from_id"] for r in batch],
+            "to_ids": [r["to_id"] for r in batch],
+            "data": [r.get("properties") or {} for r in batch],
+        }
+
+    async def _gather_batches(
+        self, batches: list[Coroutine[Any, Any, tuple[str, int]]],
+    ) -> dict[str, int]:
+        """Run batch coroutines concurrently and sum created counts per type.
+
+        The first failure cancels the batches still pending and waits for
+        them to unwind before it is raised, so no write goes out after it.
+        """
+        tasks = [asyncio.ensure_future(b) for b in batches]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            # Also runs if the caller is cancelled
+            pending = [t for t in tasks if not t.done()]
+            for t in pending:
+                t.cancel()
+            if pending:
+                await asyncio.wait(pending)
+            errors = [e for t in tasks if not t.cancelled() and (e := t.exception())]
+        if errors:
+            raise errors[0]
 
         results: dict[str, int] = {}
-        for rel_type, type_rels in by_type.items():
-            api_type = rel_type.lower()
-            created = 0
-
-            for i in range(0, len(type_rels), MAX_BULK_SIZE):
-                batch = type_rels[i : i + MAX_BULK_SIZE]
-                payload = {
-                    "relationships": [
-                        {
-                            "from_id": r["from_id"],
-                            "to_id": r["to_id"],
-                            **({"data": r["properties"]} if r.get("properties") else {}),
-                        }
-                        for r in batch
-                    ]
-                }
+        for t in tasks:
+            type_name, created = t.result()
+            results[type_name] = results.get(type_name, 0) + created
+        self._tune_bulk_size()
+        return results
+
+    async def _post_batch(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: Mapping[str, str],
+        type_name: str,
+        batch: list[dict[str, Any]],
+        to_rows: Callable[[list[dict[str, Any]]], dict[str, Any]],
+        to_columns: Callable[[list[dict[str, Any]]], dict[str, Any]],
+    ) -> tuple[str, int]:
+        """POST a single bulk batch. Returns (type_name, created_count)."""
+        resp = None
+        if self.columnar:
+            resp = await self._send_batch(
+                client, f"{url}?format=columnar", to_columns(batch), headers, type_name,
+            )
+            if self._rejects_columnar(resp):
+                # Graph API doesn't accept the columnar shape — use rows from now on
+                logger.info("Columnar bulk format not supported, using row format")
+                self.columnar = False
+                resp = None
+        if resp is None:
+            resp = await self._send_batch(client, url, to_rows(batch), headers, type_name)
+
+        if resp.status_code not in (200, 201):
+            raise RuntimeError(
+                f"Bulk create {type_name} failed: "
+                f"{resp.status_code} — {resp.text[:200]}"
+            )
+        return type_name, resp.json().get("created", len(batch))
+
+    @staticmethod
+    def _rejects_columnar(resp: httpx.Response) -> bool:
+        """True when the Graph API refused the columnar shape itself."""
+        if resp.status_code == 415:
+            return True
+        return resp.status_code == 400 and "columnar" in resp.text.lower()
+
+    async def _send_batch(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        payload: dict[str, Any],
+        headers: Mapping[str, str],
+        type_name: str,
+    ) -> httpx.Response:
+        """POST a bulk payload, retrying transient failures (429/5xx) with
+        exponential backoff and honoring Retry-After when the server sends it.
+        """
+        # Serialize once (compact) — retries resend the same bytes
+        body = _encode_body(payload)
+        for attempt in range(self.max_retries + 1):
+            async with self._inflight:
+                started = time.monotonic()
                 resp = await client.post(
-                    f"{base}/api/v1/data/bulk/relationships/{api_type}",
-                    json=payload,
-                    headers=headers,
+                    url, content=body, headers=headers, timeout=self._timeout,
                 )
-                if resp.status_code not in (200, 201):
-                    raise RuntimeError(
-                        f"Bulk create {rel_type} failed: "
-                        f"{resp.status_code} — {resp.text[:200]}"
-                    )
-                created += resp.json().get("created", len(batch))
-
-            results[rel_type] = created
-            logger.info(f"Created {created}/{len(type_rels)} {rel_type} relationships")
+                self._record_batch_latency(time.monotonic() - started)
+                self._inflight.record(resp.status_code)
+            if resp.status_code not in self.retry_statuses or attempt == self.max_retries:
+                break
+            delay = self._retry_delay(resp, attempt)
+            logger.warning(
+                f"Bulk create {type_name} got {resp.status_code}, "
+                f"retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})"
+            )
+            await asyncio.sleep(delay)
+        return resp
 
-        return results
+    @staticmethod
+    def _retry_delay(resp: httpx.Response, attempt: int) -> float:
+        retry_after = resp.headers.get("retry-after", "")
+        try:
+            return min(MAX_RETRY_DELAY, float(retry_after))
+        except ValueError:
+            return min(MAX_RETRY_DELAY, 0.5 * 2**attempt) + random.random() * 0.25
+
+    def _record_batch_latency(self, elapsed: float) -> None:
+        if self._batch_latency is None:
+            self._batch_latency = elapsed
+        else:
+            self._batch_latency = 0.2 * elapsed + 0.8 * self._batch_latency
+
+    def _tune_bulk_size(self) -> None:
+        """Grow batches while the API answers fast, shrink when it slows down."""
+        if self._batch_latency is None:
+            return
+        low, high = BULK_SIZE_BOUNDS
+        if self._batch_latency < 0.2:
+            self._bulk_size = min(high, int(self._bulk_size * 1.5))
+        elif self._batch_latency > 2.0:
+            self._bulk_size = max(low, int(self._bulk_size * 0.75))
 
     # ====================================================================
     # NORMALIZATION HELPERS
@@ -328,14 +779,16 @@ class GraphClient:
 
     @staticmethod
     def _normalize_node(node_data: dict[str, Any]) -> dict[str, Any]:
+        # node_data is freshly parsed response JSON — reuse it as properties
         entity_id = node_data.get("entity_id", "")
         path = node_data.get("hierarchical_path", "")
-        label = path.split(":")[-1] if path else "Unknown"
+        label = path.rpartition(":")[2] if path else "Unknown"
+        node_data["id"] = entity_id
         return {
             "id": entity_id,
             "entity_type": label,
             "labels": [label],
-            "properties": {**node_data, "id": entity_id},
+            "properties": node_data,
         }
 
     @staticmethod
@@ -346,9 +799,5 @@ class GraphClient:
             "type": rel_data.get("rel_type", rel_data.get("type", "")),
             "from_id": rel_data.get("from_id", ""),
             "to_id": rel_data.get("to_id", ""),
-            "properties": {
-                k: v
-                for k, v in rel_data.items()
-                if k not in ("rel_id", "from_id", "to_id", "rel_type", "from_path", "to_path")
-            },
+            "properties": {k: v for k, v in rel_data.items() if k not in _REL_SKIP},
         }
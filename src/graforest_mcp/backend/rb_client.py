@@ -17,10 +17,13 @@
 import asyncio
 import logging
 import os
+import random
 from typing import Any
 
 import httpx
 
+from .graph_client import HTTP2_ENABLED, HTTP_LIMITS, prewarm_graph_api
+
 logger = logging.getLogger(__name__)
 
 # Default endpoint — can be overridden via env var
@@ -151,8 +154,14 @@ class RBClient:
             base_url=RATIONALBLOKS_MCP_URL,
             headers={"Authorization": f"Bearer {self._api_key}"},
             timeout=120.0,
+            http2=HTTP2_ENABLED,
+            limits=HTTP_LIMITS,
         )
 
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
     async def close(self) -> None:
         await self._client.aclose()
 
@@ -236,7 +245,8 @@ class RBClient:
 
         1. Create graph project with knowledge graph schema
         2. Deploy to staging
-        3. Poll deployment job until complete
+        3. Poll deployment job until complete (exponential backoff up to
+           poll_interval), pre-warming a connection to the new Graph API
         4. Return project info with graph API URL
         """
         logger.info(f"Provisioning graph project: {name}")
@@ -258,28 +268,44 @@ class RBClient:
             raise Exception(f"deploy_graph_staging returned no job_id: {deploy_result}")
         logger.info(f"Deployment started, job_id={job_id}")
 
-        # Step 3: Poll
+        # Step 3: Poll — start fast to catch quick deploys, back off to poll_interval.
+        # Meanwhile, warm a connection to the Graph API off the critical path.
+        project_code = project.get("project_code")
+        prewarm: asyncio.Task | None = None
         elapsed = 0.0
-        while elapsed < max_wait:
-            await asyncio.sleep(poll_interval)
-            elapsed += poll_interval
-
-            status = await self.get_job_status(job_id)
-            job_status = status.get("status", "unknown")
-            logger.debug(f"Job {job_id}: {job_status} ({elapsed:.0f}s)")
-
-            if job_status == "completed":
-                logger.info(f"Deployment completed for {project_id} ({elapsed:.0f}s)")
-                break
-            if job_status in ("failed", "error"):
-                error = status.get("error", "Unknown deployment error")
-                raise Exception(f"Deployment failed for {project_id}: {error}")
-        else:
-            raise Exception(
-                f"Deployment timed out after {max_wait}s for {project_id}"
-            )
+        attempt = 0
+        try:
+            while elapsed < max_wait:
+                delay = min(poll_interval, 0.25 * (1.5 ** attempt)) + random.random() * 0.1
+                attempt += 1
+                await asyncio.sleep(delay)
+                elapsed += delay
+
+                status = await self.get_job_status(job_id)
+                job_status = status.get("status", "unknown")
+                logger.debug(f"Job {job_id}: {job_status} ({elapsed:.0f}s)")
+
+                if job_status == "completed":
+                    logger.info(f"Deployment completed for {project_id} ({elapsed:.0f}s)")
+                    break
+                if job_status in ("failed", "error"):
+                    error = status.get("error", "Unknown deployment error")
+                    raise Exception(f"Deployment failed for {project_id}: {error}")
+                if prewarm is None and project_code:
+                    prewarm = asyncio.create_task(
+                        prewarm_graph_api(project_code, max_wait=max_wait),
+                    )
+            else:
+                raise Exception(
+                    f"Deployment timed out after {max_wait}s for {project_id}"
+                )
+
+            # Step 4: Return project info — the pre-warm may still land meanwhile,
+            # but it never outlives this call
+            info = await self.get_graph_project_info(project_id)
+        finally:
+            if prewarm is not None:
+                prewarm.cancel()
 
-        # Step 4: Return project info
-        info = await self.get_graph_project_info(project_id)
         logger.info(f"Graph project ready: {info.get('project_code', project_id)}")
         return info
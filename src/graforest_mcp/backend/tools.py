@@ -33,7 +33,14 @@
 #   calls add_knowledge_nodes/relationships. Graforest is the data layer.
 # ============================================================================
 
+import asyncio
+import codecs
+import html as html_lib
 import logging
+import os
+import re
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from mcp.types import (
@@ -46,14 +53,37 @@ from mcp.types import (
 
 from .. import __version__
 from ..core import BaseMCPServer
-from .graph_client import GraphClient
+from .graph_client import (
+    SCHEMA_CACHE_SIZE,
+    SCHEMA_CACHE_TTL,
+    GraphClient,
+    close_shared_client,
+    get_shared_client,
+)
 from .rb_client import RBClient
 
+# Optional C HTML parser (lexbor) for fetch_url_content — regex fallback otherwise
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Regex fallback for HTML → text, compiled once
+_RE_SCRIPT_STYLE = re.compile(r"<(script|style)[^>]*>.*?</\1>", re.DOTALL | re.IGNORECASE)
+_RE_TAG = re.compile(r"<[^>]+>")
+# <title>/<textarea> content is literal text to lexbor but markup to the regex
+# path — strip tags inside them before parsing so both give the same text
+_RE_RCDATA = re.compile(r"(<(title|textarea)\b[^>]*>)(.*?)(</\2\s*>)", re.DOTALL | re.IGNORECASE)
+
 logger = logging.getLogger(__name__)
 
 __all__ = [
     "GRAFOREST_TOOLS",
     "GRAFOREST_PROMPTS",
+    "READ_ONLY_TOOLS",
+    "DESTRUCTIVE_TOOLS",
+    "IDEMPOTENT_TOOLS",
+    "OPEN_WORLD_TOOLS",
     "GraforestMCPServer",
     "create_graforest_server",
 ]
@@ -63,7 +93,8 @@ __all__ = [
 # TOOL DEFINITIONS
 # ============================================================================
 
-GRAFOREST_TOOLS: list[dict[str, Any]] = [
+# Immutable — tool definitions are registered once and must not change at runtime
+GRAFOREST_TOOLS: tuple[dict[str, Any], ...] = (
     # ================================================================
     # PROVISIONING (3 tools)
     # ================================================================
@@ -142,7 +173,8 @@ GRAFOREST_TOOLS: list[dict[str, Any]] = [
             "Bulk create entities in the knowledge graph. The LLM extracts entities from "
             "content and provides them here. Each entity needs an entity_id (kebab-case), "
             "entity_type (matching schema — e.g., 'Topic', 'Article', 'Author', 'Concept'), "
-            "and properties dict matching that type's schema fields.\n\n"
+            "and properties dict matching that type's schema fields. Arrays of any size "
+            "are accepted — they are split into bulk batches automatically.\n\n"
             "Use get_knowledge_schema first to see available entity types and their fields."
         ),
         "inputSchema": {
@@ -197,7 +229,8 @@ GRAFOREST_TOOLS: list[dict[str, Any]] = [
             "Bulk create relationships between entities in the knowledge graph. "
             "Each relationship needs from_id, to_id (matching existing entity_ids), "
             "rel_type (matching schema — e.g., 'AUTHORED', 'COVERS', 'REFERENCES'), "
-            "and optional properties.\n\n"
+            "and optional properties. Arrays of any size are accepted — they are "
+            "grouped by rel_type and split into bulk batches automatically.\n\n"
             "Use get_knowledge_schema first to see available relationship types."
         ),
         "inputSchema": {
@@ -306,6 +339,11 @@ GRAFOREST_TOOLS: list[dict[str, Any]] = [
                     "enum": ["staging", "production"],
                     "default": "staging",
                 },
+                "refresh": {
+                    "type": "boolean",
+                    "description": "Bypass the cached schema (cached for a few minutes)",
+                    "default": False,
+                },
             },
             "required": ["project_code"],
         },
@@ -556,53 +594,66 @@ GRAFOREST_TOOLS: list[dict[str, Any]] = [
             "openWorldHint": True,
         },
     },
-]
+)
+
+
+def _tools_with(hint: str) -> frozenset[str]:
+    return frozenset(t["name"] for t in GRAFOREST_TOOLS if t["annotations"][hint])
+
+
+# Tool names indexed by annotation flag — O(1) capability checks
+READ_ONLY_TOOLS = _tools_with("readOnlyHint")
+DESTRUCTIVE_TOOLS = _tools_with("destructiveHint")
+IDEMPOTENT_TOOLS = _tools_with("idempotentHint")
+OPEN_WORLD_TOOLS = _tools_with("openWorldHint")
 
 
 # ============================================================================
 # PROMPT DEFINITIONS
 # ============================================================================
 
-GRAFOREST_PROMPTS: list[Prompt] = [
-    Prompt(
+# Developer-controlled literals — model_construct skips Pydantic validation
+
+GRAFOREST_PROMPTS: tuple[Prompt, ...] = (
+    Prompt.model_construct(
         name="ingest-content",
         description=(
             "Ingest text content into a knowledge graph using the 3-call workflow. "
             "Extracts entities and relationships from the provided text."
         ),
         arguments=[
-            PromptArgument(
+            PromptArgument.model_construct(
                 name="project_code",
                 description="Project code for the target knowledge graph",
                 required=True,
             ),
-            PromptArgument(
+            PromptArgument.model_construct(
                 name="text",
                 description="Text content to extract knowledge from",
                 required=True,
             ),
         ],
     ),
-    Prompt(
+    Prompt.model_construct(
         name="explore-graph",
         description=(
             "Explore a knowledge graph — get statistics, search for concepts, "
             "and traverse connections."
         ),
         arguments=[
-            PromptArgument(
+            PromptArgument.model_construct(
                 name="project_code",
                 description="Project code for the knowledge graph to explore",
                 required=True,
             ),
-            PromptArgument(
+            PromptArgument.model_construct(
                 name="topic",
                 description="Optional topic or concept to start exploring from",
                 required=False,
             ),
         ],
     ),
-]
+)
 
 
 # ============================================================================
@@ -610,6 +661,40 @@ GRAFOREST_PROMPTS: list[Prompt] = [
 # ============================================================================
 
 MAX_CONTENT_LENGTH = 500_000  # 500k chars
+# HTTP request body cap — a full-size ingest_text_content call fits even when
+# the client escapes every char as \uXXXX (6 bytes), plus envelope headroom
+MAX_REQUEST_BYTES = int(os.environ.get(
+    "GRAFOREST_MAX_REQUEST_BYTES", str(MAX_CONTENT_LENGTH * 6 + 64 * 1024),
+))
+# Raw HTML read by fetch_url_content — markup leaves room for the text limit
+MAX_HTML_LENGTH = 4 * MAX_CONTENT_LENGTH
+
+EXTRACTION_INSTRUCTIONS = (
+    "Extract ALL entities and relationships from the provided text.\n\n"
+    "ENTITY TYPES available: {entity_types}\n"
+    "RELATIONSHIP TYPES available: {relationship_types}\n\n"
+    "RULES:\n"
+    "1. Use kebab-case entity_ids (e.g., 'machine-learning', 'iron-fe')\n"
+    "2. Entity types must match the schema keys exactly (lowercase)\n"
+    "3. Include ALL required fields for each entity type\n"
+    "4. Extract as many entities as the text supports — be thorough\n"
+    "5. Create relationships between related entities\n"
+    "6. Relationship from_id and to_id must match entity_ids you created\n\n"
+    "NEXT STEPS:\n"
+    "1. Process the text and extract entities + relationships\n"
+    "2. Call add_knowledge_nodes with ALL extracted entities\n"
+    "3. Call add_knowledge_relationships with ALL extracted relationships"
+)
+
+
+# ============================================================================
+# CONCURRENCY LIMITS
+# ============================================================================
+
+# Tools that mutate graphs or infrastructure share a smaller concurrency cap
+WRITE_TOOLS = frozenset(t["name"] for t in GRAFOREST_TOOLS) - READ_ONLY_TOOLS
+WRITE_CONCURRENCY = int(os.environ.get("GRAFOREST_WRITE_CONCURRENCY", "8"))
+READ_CONCURRENCY = int(os.environ.get("GRAFOREST_READ_CONCURRENCY", "32"))
 
 
 # ============================================================================
@@ -648,6 +733,8 @@ MANAGEMENT:
 
 13 tools: 3 provisioning + 2 data write + 6 read + 1 ingestion + 1 utility"""
 
+    MAX_REQUEST_BYTES = MAX_REQUEST_BYTES
+
     def __init__(
         self,
         api_key: str | None = None,
@@ -661,8 +748,23 @@ MANAGEMENT:
             http_mode=http_mode,
         )
 
-        # HTTP clients — created lazily per request
+        # HTTP clients — Graph API pool is shared; RBClient is built on first use
         self._graph_client = GraphClient()
+        self._rb_client: RBClient | None = None
+
+        # Concurrent tool calls beyond these caps wait their turn
+        self._write_sem = asyncio.Semaphore(WRITE_CONCURRENCY)
+        self._read_sem = asyncio.Semaphore(READ_CONCURRENCY)
+
+        # (project_code, environment) -> (expires_at, field_guide)
+        self._field_guide_cache: dict[tuple[str, str], tuple[float, dict[str, Any]]] = {}
+        # (project_code, environment) -> (schema, (entity_types, relationship_types, instructions))
+        self._extraction_guides: dict[tuple[str, str], tuple[dict[str, Any], tuple]] = {}
+
+        # Tool name → bound handler (_tool_<name>); a missing handler fails here
+        self._tool_dispatch: dict[str, Callable[[dict], Awaitable[Any]]] = {
+            tool["name"]: getattr(self, f"_tool_{tool['name']}") for tool in GRAFOREST_TOOLS
+        }
 
         # Register tools, prompts, handlers
         self.register_tools(GRAFOREST_TOOLS)
@@ -676,8 +778,19 @@ MANAGEMENT:
         self.setup_handlers()
 
     def _get_rb_client(self) -> RBClient:
-        """Get RBClient using the Graforest service account key."""
-        return RBClient()
+        """Get the pooled RBClient (Graforest service account key)."""
+        if self._rb_client is None or self._rb_client.is_closed:
+            self._rb_client = RBClient()
+        return self._rb_client
+
+    async def close(self) -> None:
+        """Close the pooled RationalBloks client and the shared Graph API pool."""
+        try:
+            if self._rb_client is not None:
+                await self._rb_client.close()
+                self._rb_client = None
+        finally:
+            await close_shared_client()
 
     def _get_auth_token(self) -> str:
         """Get the auth token for Graph API calls.
@@ -694,330 +807,416 @@ MANAGEMENT:
             raise ValueError("No authentication token available")
         return api_key
 
+    def _auth_env(self, arguments: dict) -> tuple[str, str]:
+        """Auth token and target environment shared by every Graph API tool."""
+        return self._get_auth_token(), arguments.get("environment", "staging")
+
     # ====================================================================
     # TOOL HANDLER — routes all 13 tools
     # ====================================================================
 
     async def _handle_tool(self, name: str, arguments: dict) -> Any:
-        """Route tool calls to the appropriate handler."""
-
-        # ============================================================
-        # PROVISIONING (via RationalBloks service account)
-        # ============================================================
-
-        if name == "create_knowledge_project":
-            async with self._get_rb_client() as rb:
-                result = await rb.provision_graph_project(
-                    name=arguments["name"],
-                    description=arguments.get("description"),
-                )
-            return {
-                "project_id": result.get("id") or result.get("project_id"),
-                "project_code": result.get("project_code"),
-                "name": result.get("name"),
-                "status": "deployed",
-                "message": "Knowledge graph created and deployed to staging",
-                "graph_api_url": result.get("staging_url") or result.get("graph_api_url"),
-            }
+        """Route a tool call to its handler under the read or write concurrency cap."""
+        handler = self._tool_dispatch.get(name)
+        if handler is None:
+            raise ValueError(f"Unknown tool: {name}")
+        sem = self._write_sem if name in WRITE_TOOLS else self._read_sem
+        async with sem:
+            return await handler(arguments)
 
-        if name == "list_knowledge_projects":
-            async with self._get_rb_client() as rb:
-                projects = await rb.list_projects()
-            graph_projects = [
-                p for p in projects
-                if p.get("project_type", "graph") != "relational"
-            ]
-            return {
-                "projects": [
-                    {
-                        "project_id": p.get("id") or p.get("project_id"),
-                        "name": p.get("name"),
-                        "project_code": p.get("project_code"),
-                        "status": p.get("status"),
-                        "created_at": p.get("created_at"),
-                    }
-                    for p in graph_projects
-                ],
-                "count": len(graph_projects),
-            }
+    # ====================================================================
+    # PROVISIONING (via RationalBloks service account)
+    # ====================================================================
 
-        if name == "delete_knowledge_project":
-            async with self._get_rb_client() as rb:
-                await rb.delete_graph_project(arguments["project_id"])
-            return {
-                "project_id": arguments["project_id"],
-                "status": "deleted",
-                "message": "Graph project and all data permanently deleted",
-            }
+    async def _tool_create_knowledge_project(self, arguments: dict) -> Any:
+        rb = self._get_rb_client()
+        result = await rb.provision_graph_project(
+            name=arguments["name"],
+            description=arguments.get("description"),
+        )
+        self._invalidate_schema_caches()
+        return {
+            "project_id": result.get("id") or result.get("project_id"),
+            "project_code": result.get("project_code"),
+            "name": result.get("name"),
+            "status": "deployed",
+            "message": "Knowledge graph created and deployed to staging",
+            "graph_api_url": result.get("staging_url") or result.get("graph_api_url"),
+        }
+
+    async def _tool_list_knowledge_projects(self, arguments: dict) -> Any:
+        projects = await self._get_rb_client().list_projects()
+        # Filter and project in one pass
+        graph_projects = []
+        for p in projects:
+            if p.get("project_type", "graph") == "relational":
+                continue
+            graph_projects.append({
+                "project_id": p.get("id") or p.get("project_id"),
+                "name": p.get("name"),
+                "project_code": p.get("project_code"),
+                "status": p.get("status"),
+                "created_at": p.get("created_at"),
+            })
+        return {
+            "projects": graph_projects,
+            "count": len(graph_projects),
+        }
+
+    async def _tool_delete_knowledge_project(self, arguments: dict) -> Any:
+        await self._get_rb_client().delete_graph_project(arguments["project_id"])
+        self._invalidate_schema_caches()
+        return {
+            "project_id": arguments["project_id"],
+            "status": "deleted",
+            "message": "Graph project and all data permanently deleted",
+        }
 
-        # ============================================================
-        # DATA WRITE
-        # ============================================================
+    # ====================================================================
+    # DATA WRITE
+    # ====================================================================
 
-        if name == "add_knowledge_nodes":
-            token = self._get_auth_token()
-            env = arguments.get("environment", "staging")
-            result = await self._graph_client.bulk_create_entities(
-                project_code=arguments["project_code"],
-                environment=env,
-                token=token,
-                entities=arguments["entities"],
-            )
-            total = sum(result.values())
-            return {
-                "created": result,
-                "total_created": total,
-                "message": f"Created {total} nodes across {len(result)} types",
-            }
+    async def _tool_add_knowledge_nodes(self, arguments: dict) -> Any:
+        token, env = self._auth_env(arguments)
+        result = await self._graph_client.bulk_create_entities(
+            project_code=arguments["project_code"],
+            environment=env,
+            token=token,
+            entities=arguments["entities"],
+        )
+        total = sum(result.values())
+        return {
+            "created": result,
+            "total_created": total,
+            "message": f"Created {total} nodes across {len(result)} types",
+        }
+
+    async def _tool_add_knowledge_relationships(self, arguments: dict) -> Any:
+        token, env = self._auth_env(arguments)
+        result = await self._graph_client.bulk_create_relationships(
+            project_code=arguments["project_code"],
+            environment=env,
+            token=token,
+            relationships=arguments["relationships"],
+        )
+        total = sum(result.values())
+        return {
+            "created": result,
+            "total_created": total,
+            "message": f"Created {total} relationships across {len(result)} types",
+        }
 
-        if name == "add_knowledge_relationships":
-            token = self._get_auth_token()
-            env = arguments.get("environment", "staging")
-            result = await self._graph_client.bulk_create_relationships(
-                project_code=arguments["project_code"],
-                environment=env,
-                token=token,
-                relationships=arguments["relationships"],
-            )
-            total = sum(result.values())
-            return {
-                "created": result,
-                "total_created": total,
-                "message": f"Created {total} relationships across {len(result)} types",
-            }
+    # ====================================================================
+    # DATA READ
+    # ====================================================================
 
-        # ============================================================
-        # DATA READ
-        # ============================================================
+    async def _tool_search_knowledge_graph(self, arguments: dict) -> Any:
+        token, env = self._auth_env(arguments)
+        return await self._graph_client.search_text(
+            project_code=arguments["project_code"],
+            environment=env,
+            token=token,
+            query=arguments["query"],
+        )
 
-        if name == "search_knowledge_graph":
-            token = self._get_auth_token()
-            env = arguments.get("environment", "staging")
-            return await self._graph_client.search_text(
-                project_code=arguments["project_code"],
-                environment=env,
-                token=token,
-                query=arguments["query"],
-            )
+    async def _tool_get_knowledge_schema(self, arguments: dict) -> Any:
+        token, env = self._auth_env(arguments)
+        return await self._graph_client.get_schema(
+            project_code=arguments["project_code"],
+            environment=env,
+            token=token,
+            refresh=arguments.get("refresh", False),
+        )
 
-        if name == "get_knowledge_schema":
-            token = self._get_auth_token()
-            env = arguments.get("environment", "staging")
-            return await self._graph_client.get_schema(
-                project_code=arguments["project_code"],
-                environment=env,
-                token=token,
-            )
+    async def _tool_get_knowledge_statistics(self, arguments: dict) -> Any:
+        token, env = self._auth_env(arguments)
+        return await self._graph_client.get_statistics(
+            project_code=arguments["project_code"],
+            environment=env,
+            token=token,
+        )
 
-        if name == "get_knowledge_statistics":
-            token = self._get_auth_token()
-            env = arguments.get("environment", "staging")
-            return await self._graph_client.get_statistics(
-                project_code=arguments["project_code"],
-                environment=env,
-                token=token,
-            )
+    async def _tool_traverse_knowledge_graph(self, arguments: dict) -> Any:
+        token, env = self._auth_env(arguments)
+        max_depth = min(arguments.get("max_depth", 3), 5)
+        return await self._graph_client.traverse(
+            project_code=arguments["project_code"],
+            environment=env,
+            token=token,
+            start_entity_type=arguments["start_entity_type"],
+            start_entity_id=arguments["start_entity_id"],
+            max_depth=max_depth,
+            direction=arguments.get("direction", "both"),
+        )
 
-        if name == "traverse_knowledge_graph":
-            token = self._get_auth_token()
-            env = arguments.get("environment", "staging")
-            max_depth = min(arguments.get("max_depth", 3), 5)
-            return await self._graph_client.traverse(
-                project_code=arguments["project_code"],
-                environment=env,
-                token=token,
-                start_entity_type=arguments["start_entity_type"],
-                start_entity_id=arguments["start_entity_id"],
-                max_depth=max_depth,
-                direction=arguments.get("direction", "both"),
-            )
+    async def _tool_list_knowledge_entities(self, arguments: dict) -> Any:
+        token, env = self._auth_env(arguments)
+        result = await self._graph_client.list_entities(
+            project_code=arguments["project_code"],
+            environment=env,
+            token=token,
+            entity_type=arguments["entity_type"],
+            limit=arguments.get("limit", 50),
+            offset=arguments.get("offset", 0),
+        )
+        return {"entities": result, "count": len(result)}
+
+    async def _tool_get_knowledge_entity(self, arguments: dict) -> Any:
+        token, env = self._auth_env(arguments)
+        return await self._graph_client.get_entity(
+            project_code=arguments["project_code"],
+            environment=env,
+            token=token,
+            entity_type=arguments["entity_type"],
+            entity_id=arguments["entity_id"],
+        )
 
-        if name == "list_knowledge_entities":
-            token = self._get_auth_token()
-            env = arguments.get("environment", "staging")
-            result = await self._graph_client.list_entities(
-                project_code=arguments["project_code"],
-                environment=env,
-                token=token,
-                entity_type=arguments["entity_type"],
-                limit=arguments.get("limit", 50),
-                offset=arguments.get("offset", 0),
-            )
-            return {"entities": result, "count": len(result)}
+    # ====================================================================
+    # INGESTION
+    # ====================================================================
 
-        if name == "get_knowledge_entity":
-            token = self._get_auth_token()
-            env = arguments.get("environment", "staging")
-            return await self._graph_client.get_entity(
-                project_code=arguments["project_code"],
-                environment=env,
-                token=token,
-                entity_type=arguments["entity_type"],
-                entity_id=arguments["entity_id"],
+    async def _tool_ingest_text_content(self, arguments: dict) -> Any:
+        token, env = self._auth_env(arguments)
+        text = arguments["text_content"]
+        project_code = arguments["project_code"]
+        source_title = arguments.get("source_title", "")
+        source_url = arguments.get("source_url", "")
+
+        # Size checks first — len() is O(1); no full-string strip() copy
+        char_count = len(text)
+        if char_count > MAX_CONTENT_LENGTH:
+            raise ValueError(
+                f"Text content too large ({char_count:,} chars). "
+                f"Maximum is {MAX_CONTENT_LENGTH:,} chars. "
+                f"Split into smaller chunks and call ingest_text_content multiple times."
             )
+        if char_count < 50 or self._stripped_length(text) < 50:
+            raise ValueError("Text content too short — provide at least 50 characters")
 
-        # ============================================================
-        # INGESTION
-        # ============================================================
-
-        if name == "ingest_text_content":
-            token = self._get_auth_token()
-            text = arguments["text_content"]
-            project_code = arguments["project_code"]
-            env = arguments.get("environment", "staging")
-            source_title = arguments.get("source_title", "")
-            source_url = arguments.get("source_url", "")
-
-            if not text or len(text.strip()) < 50:
-                raise ValueError("Text content too short — provide at least 50 characters")
-            if len(text) > MAX_CONTENT_LENGTH:
-                raise ValueError(
-                    f"Text content too large ({len(text):,} chars). "
-                    f"Maximum is {MAX_CONTENT_LENGTH:,} chars. "
-                    f"Split into smaller chunks and call ingest_text_content multiple times."
-                )
-
-            # Fetch the project's graph schema
-            schema = await self._graph_client.get_schema(
+        # Graph schema and the (best-effort) field guide are independent — fetch together
+        schema, field_guide = await asyncio.gather(
+            self._graph_client.get_schema(
                 project_code=project_code,
                 environment=env,
                 token=token,
-            )
+            ),
+            self._get_field_guide(project_code, env),
+        )
 
-            # Build extraction guide from schema
-            entity_types = {}
-            for key, info in schema.get("entities", {}).items():
-                entity_types[key] = {"path": info.get("path", key)}
-
-            relationship_types = {}
-            for key, info in schema.get("relationships", {}).items():
-                relationship_types[key] = {
-                    "type_name": info.get("type_name", key.upper()),
-                    "from": info.get("from_path", ""),
-                    "to": info.get("to_path", ""),
-                }
-
-            # Try to get full schema definition (has field-level details)
-            field_guide: dict[str, Any] = {}
-            try:
-                async with self._get_rb_client() as rb:
-                    projects = await rb.list_projects()
-                    project = next(
-                        (p for p in projects if p.get("project_code") == project_code),
-                        None,
-                    )
-                    if project:
-                        pid = project.get("id") or project.get("project_id")
-                        if pid:
-                            full_schema = await rb.get_graph_schema(pid)
-                            if full_schema and "nodes" in full_schema:
-                                self._extract_field_guide(full_schema["nodes"], field_guide)
-            except Exception as e:
-                logger.debug(f"Could not fetch full schema for extraction guide: {e}")
-
-            char_count = len(text)
-            word_count = len(text.split())
-
-            return {
-                "status": "ready_for_extraction",
-                "project_code": project_code,
-                "source": {
-                    "title": source_title,
-                    "url": source_url,
-                    "char_count": char_count,
-                    "word_count": word_count,
-                    "estimated_tokens": char_count // 4,
-                },
-                "schema": {
-                    "entity_types": entity_types,
-                    "relationship_types": relationship_types,
-                    "field_details": field_guide or "Use get_knowledge_schema for field details",
-                },
-                "extraction_instructions": (
-                    f"Extract ALL entities and relationships from the provided text.\n\n"
-                    f"ENTITY TYPES available: {', '.join(entity_types.keys())}\n"
-                    f"RELATIONSHIP TYPES available: {', '.join(relationship_types.keys())}\n\n"
-                    f"RULES:\n"
-                    f"1. Use kebab-case entity_ids (e.g., 'machine-learning', 'iron-fe')\n"
-                    f"2. Entity types must match the schema keys exactly (lowercase)\n"
-                    f"3. Include ALL required fields for each entity type\n"
-                    f"4. Extract as many entities as the text supports — be thorough\n"
-                    f"5. Create relationships between related entities\n"
-                    f"6. Relationship from_id and to_id must match entity_ids you created\n\n"
-                    f"NEXT STEPS:\n"
-                    f"1. Process the text and extract entities + relationships\n"
-                    f"2. Call add_knowledge_nodes with ALL extracted entities\n"
-                    f"3. Call add_knowledge_relationships with ALL extracted relationships"
-                ),
-            }
+        entity_types, relationship_types, instructions = self._get_extraction_guide(
+            project_code, env, schema,
+        )
 
-        # ============================================================
-        # UTILITY
-        # ============================================================
+        word_count = len(text.split())
+
+        return {
+            "status": "ready_for_extraction",
+            "project_code": project_code,
+            "source": {
+                "title": source_title,
+                "url": source_url,
+                "char_count": char_count,
+                "word_count": word_count,
+                "estimated_tokens": char_count // 4,
+            },
+            "schema": {
+                "entity_types": entity_types,
+                "relationship_types": relationship_types,
+                "field_details": field_guide or "Use get_knowledge_schema for field details",
+            },
+            "extraction_instructions": instructions,
+        }
 
-        if name == "fetch_url_content":
-            return await self._fetch_url(arguments["url"])
+    # ====================================================================
+    # UTILITY
+    # ====================================================================
 
-        raise ValueError(f"Unknown tool: {name}")
+    async def _tool_fetch_url_content(self, arguments: dict) -> Any:
+        return await self._fetch_url(arguments["url"])
 
     # ====================================================================
     # HELPER METHODS
     # ====================================================================
 
+    @staticmethod
+    def _stripped_length(text: str, probe: int = 200) -> int:
+        """len(text.strip()) that only copies the first/last `probe` chars of long text."""
+        if len(text) <= 2 * probe:
+            return len(text.strip())
+        head = text[:probe].lstrip()
+        tail = text[-probe:].rstrip()
+        if not head or not tail:
+            return len(text.strip())  # whitespace runs past the probe — rare
+        return len(text) - (probe - len(head)) - (probe - len(tail))
+
+    def _invalidate_schema_caches(self) -> None:
+        self._graph_client.clear_schema_cache()
+        self._field_guide_cache.clear()
+        self._extraction_guides.clear()
+
+    def _get_extraction_guide(
+        self, project_code: str, env: str, schema: dict[str, Any],
+    ) -> tuple[dict[str, Any], dict[str, Any], str]:
+        """Entity/relationship type maps and rendered instructions for a schema.
+
+        Rebuilt only when GraphClient hands back a different schema object,
+        i.e. when its schema cache entry was refreshed.
+        """
+        cache_key = (project_code, env)
+        cached = self._extraction_guides.get(cache_key)
+        if cached and cached[0] is schema:
+            return cached[1]
+
+        # Build extraction guide from schema
+        entity_types = {}
+        for key, info in schema.get("entities", {}).items():
+            entity_types[key] = {"path": info.get("path", key)}
+
+        relationship_types = {}
+        for key, info in schema.get("relationships", {}).items():
+            relationship_types[key] = {
+                "type_name": info.get("type_name", key.upper()),
+                "from": info.get("from_path", ""),
+                "to": info.get("to_path", ""),
+            }
+
+        instructions = EXTRACTION_INSTRUCTIONS.format(
+            entity_types=", ".join(entity_types),
+            relationship_types=", ".join(relationship_types),
+        )
+        guide = (entity_types, relationship_types, instructions)
+        if len(self._extraction_guides) >= SCHEMA_CACHE_SIZE:
+            self._extraction_guides.clear()
+        self._extraction_guides[cache_key] = (schema, guide)
+        return guide
+
+    async def _get_field_guide(self, project_code: str, env: str) -> dict[str, Any]:
+        """Field-level extraction guide from the full schema definition, TTL-cached."""
+        key = (project_code, env)
+        now = time.monotonic()
+        cached = self._field_guide_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        # Try to get full schema definition (has field-level details)
+        field_guide: dict[str, Any] = {}
+        try:
+            rb = self._get_rb_client()
+            projects = await rb.list_projects()
+            project = next(
+                (p for p in projects if p.get("project_code") == project_code),
+                None,
+            )
+            if project:
+                pid = project.get("id") or project.get("project_id")
+                if pid:
+                    full_schema = await rb.get_graph_schema(pid)
+                    if full_schema and "nodes" in full_schema:
+                        self._extract_field_guide(full_schema["nodes"], field_guide)
+        except Exception as e:
+            # Not cached — the next call retries
+            logger.debug(f"Could not fetch full schema for extraction guide: {e}")
+            return field_guide
+
+        if len(self._field_guide_cache) >= SCHEMA_CACHE_SIZE:
+            self._field_guide_cache.clear()
+        self._field_guide_cache[key] = (now + SCHEMA_CACHE_TTL, field_guide)
+        return field_guide
+
     @staticmethod
     def _extract_field_guide(
         nodes_schema: dict[str, Any],
         field_guide: dict[str, Any],
     ) -> None:
-        """Recursively extract field info from the full graph schema."""
-        for key, val in nodes_schema.items():
-            if isinstance(val, dict) and "schema" in val:
-                fields = {}
-                for fname, fdef in val["schema"].items():
-                    ftype = fdef.get("type", "string")
-                    req = " (REQUIRED)" if fdef.get("required") else ""
-                    fields[fname] = f"{ftype}{req}"
-                field_guide[key.lower()] = fields
-                # Recurse for nested entity types
-                for nested_key, nested_val in val.items():
-                    if isinstance(nested_val, dict) and "schema" in nested_val:
-                        GraforestMCPServer._extract_field_guide(
-                            {nested_key: nested_val}, field_guide,
-                        )
+        """Extract field info from the full graph schema, nested types included.
+
+        Walks an explicit stack in the same pre-order a recursive walk would.
+        """
+        def entity_types(node: dict[str, Any]) -> list[tuple[str, Any]]:
+            return [
+                (key, val) for key, val in node.items()
+                if isinstance(val, dict) and "schema" in val
+            ]
+
+        stack = entity_types(nodes_schema)
+        stack.reverse()
+        while stack:
+            key, val = stack.pop()
+            fields = {}
+            for fname, fdef in val["schema"].items():
+                ftype = fdef.get("type", "string")
+                req = " (REQUIRED)" if fdef.get("required") else ""
+                fields[fname] = f"{ftype}{req}"
+            field_guide[key.lower()] = fields
+            # Nested entity types are visited next
+            nested = entity_types(val)
+            nested.reverse()
+            stack.extend(nested)
 
     @staticmethod
     async def _fetch_url(url: str) -> dict[str, Any]:
         """Fetch and clean text from a URL."""
-        import httpx
-
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            resp = await client.get(url)
+        # Pooled client — keepalive connections are reused across fetches
+        client = get_shared_client()
+        async with client.stream("GET", url, follow_redirects=True, timeout=30.0) as resp:
             resp.raise_for_status()
             content_type = resp.headers.get("content-type", "")
+            is_html = "text/html" in content_type
 
-            if "text/html" in content_type:
-                # Basic HTML → text extraction
-                html = resp.text
-                # Strip tags (simple approach — no dependency on beautifulsoup)
-                import re
-                # Remove script/style blocks
-                text = re.sub(r"<(script|style)[^>]*>.*?</\1>", "", html, flags=re.DOTALL | re.IGNORECASE)
-                # Remove HTML tags
-                text = re.sub(r"<[^>]+>", " ", text)
-                # Collapse whitespace
-                text = re.sub(r"\s+", " ", text).strip()
+            # Decode incrementally and stop reading once we have enough
+            limit = MAX_HTML_LENGTH if is_html else MAX_CONTENT_LENGTH
+            try:
+                decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")("replace")
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")("replace")
+            parts: list[str] = []
+            size = 0
+            async for chunk in resp.aiter_bytes(65536):
+                part = decoder.decode(chunk)
+                parts.append(part)
+                size += len(part)
+                if size >= limit:
+                    break
             else:
-                text = resp.text
-
-            return {
-                "text": text[:MAX_CONTENT_LENGTH],
-                "char_count": len(text[:MAX_CONTENT_LENGTH]),
-                "metadata": {
-                    "content_type": content_type,
-                    "status_code": resp.status_code,
-                },
-                "source_url": url,
-            }
+                parts.append(decoder.decode(b"", final=True))
+            body = "".join(parts)
+
+        if is_html:
+            # CPU-bound on large pages — keep it off the event loop
+            text = await asyncio.to_thread(GraforestMCPServer._html_to_text, body[:limit])
+        else:
+            text = body
+
+        return {
+            "text": text[:MAX_CONTENT_LENGTH],
+            "char_count": len(text[:MAX_CONTENT_LENGTH]),
+            "metadata": {
+                "content_type": content_type,
+                "status_code": resp.status_code,
+            },
+            "source_url": url,
+        }
+
+    @staticmethod
+    def _html_to_text(html: str) -> str:
+        """Basic HTML → text extraction, via lexbor when selectolax is installed."""
+        if LexborHTMLParser is not None:
+            html = _RE_RCDATA.sub(lambda m: m[1] + _RE_TAG.sub(" ", m[3]) + m[4], html)
+            tree = LexborHTMLParser(html)
+            tree.strip_tags(["script", "style"])
+            # Whole document (incl. <title>), same as the regex path below
+            root = tree.root
+            if root is None:
+                return ""
+            return " ".join(root.text(separator=" ").split())
+
+        # Strip tags (simple approach — no dependency on beautifulsoup)
+        # Remove script/style blocks
+        text = _RE_SCRIPT_STYLE.sub(" ", html)
+        # Remove HTML tags, then decode entities (&amp; → &) as lexbor does
+        text = html_lib.unescape(_RE_TAG.sub(" ", text))
+        # Collapse whitespace (str.split's C loop, no regex pass)
+        return " ".join(text.split())
 
     # ====================================================================
     # PROMPT HANDLERS
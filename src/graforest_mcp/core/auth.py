@@ -10,12 +10,15 @@
 # Key prefix: gf_sk_ (Graforest Secret Key)
 # ============================================================================
 
+from collections import OrderedDict
+from collections.abc import Mapping
 from typing import Any
 from starlette.requests import Request
 
 __all__ = [
     "validate_api_key",
     "extract_api_key_from_request",
+    "extract_api_key_from_headers",
     "APIKeyCache",
 ]
 
@@ -23,11 +26,23 @@ __all__ = [
 API_KEY_PREFIX = "gf_sk_"
 BEARER_PREFIX = "Bearer "
 
+# Minimum key length: prefix + at least 20 chars
+_MIN_KEY_LENGTH = len(API_KEY_PREFIX) + 20
+
 
 def validate_api_key(api_key: str | None) -> tuple[bool, str | None]:
     """Validate API key format.
     Returns: (is_valid, error_message).
     """
+    # Fast path — a well-formed key passes a single check
+    if (
+        isinstance(api_key, str)
+        and len(api_key) >= _MIN_KEY_LENGTH
+        and api_key.startswith(API_KEY_PREFIX)
+    ):
+        return True, None
+
+    # Slow path — work out which rule failed
     if not api_key:
         return False, "API key is required"
 
@@ -37,11 +52,7 @@ def validate_api_key(api_key: str | None) -> tuple[bool, str | None]:
     if not api_key.startswith(API_KEY_PREFIX):
         return False, f"Invalid API key format — must start with '{API_KEY_PREFIX}'"
 
-    # Minimum length check (prefix + at least 20 chars)
-    if len(api_key) < len(API_KEY_PREFIX) + 20:
-        return False, "API key is too short"
-
-    return True, None
+    return False, "API key is too short"
 
 
 def extract_api_key_from_request(request: Request) -> str | None:
@@ -51,7 +62,12 @@ def extract_api_key_from_request(request: Request) -> str | None:
     if request is None:
         return None
 
-    auth_header = request.headers.get("authorization", "")
+    return extract_api_key_from_headers(request.headers)
+
+
+def extract_api_key_from_headers(headers: Mapping[str, str]) -> str | None:
+    """Extract API key from a case-insensitive header mapping."""
+    auth_header = headers.get("authorization", "")
 
     if not auth_header.startswith(BEARER_PREFIX):
         return None
@@ -70,10 +86,11 @@ class APIKeyCache:
     Stores validation results to avoid repeated calls to auth server.
     Cache is per-server-instance (not persistent across restarts).
     Only stores key prefix (first 20 chars) as cache key for security.
+    Least-recently-used entries are evicted one at a time when full.
     """
 
     def __init__(self, max_size: int = 100) -> None:
-        self._cache: dict[str, dict[str, Any]] = {}
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
         self._max_size = max_size
 
     def _get_cache_key(self, api_key: str) -> str:
@@ -81,14 +98,17 @@ class APIKeyCache:
 
     def get(self, api_key: str) -> dict[str, Any] | None:
         cache_key = self._get_cache_key(api_key)
-        return self._cache.get(cache_key)
+        user_info = self._cache.get(cache_key)
+        if user_info is not None:
+            self._cache.move_to_end(cache_key)
+        return user_info
 
     def set(self, api_key: str, user_info: dict[str, Any]) -> None:
-        if len(self._cache) >= self._max_size:
-            keys_to_remove = list(self._cache.keys())[: self._max_size // 2]
-            for key in keys_to_remove:
-                del self._cache[key]
         cache_key = self._get_cache_key(api_key)
+        if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+        elif len(self._cache) >= self._max_size:
+            self._cache.popitem(last=False)
         self._cache[cache_key] = user_info
 
     def clear(self) -> None:
@@ -8,16 +8,22 @@
 # ============================================================================
 
 import json
-import sys
+import logging
+import os
+from collections.abc import Sequence
+from functools import lru_cache
 from typing import Any, Callable
 
+import jsonschema
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.lowlevel.server import NotificationOptions
 from mcp.types import (
     Tool,
     ToolAnnotations,
     TextContent,
+    CallToolResult,
     Prompt,
     PromptArgument,
     PromptMessage,
@@ -25,9 +31,14 @@ from mcp.types import (
     Resource,
     Icon,
 )
-from starlette.requests import Request
 
-from .auth import validate_api_key, extract_api_key_from_request, APIKeyCache
+# Optional C JSON encoder for tool results — stdlib json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .auth import validate_api_key, extract_api_key_from_headers, APIKeyCache
 from .transport import run_stdio, run_http
 
 __all__ = [
@@ -35,6 +46,21 @@ __all__ = [
     "create_mcp_server",
 ]
 
+logger = logging.getLogger(__name__)
+
+# Tool results are compact JSON; set to "1" to indent them for debugging
+PRETTY_JSON = os.environ.get("GRAFOREST_PRETTY_JSON", "") == "1"
+
+if orjson is not None:
+    # Datetimes go through default=str like the stdlib path, so output matches
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | (orjson.OPT_INDENT_2 if PRETTY_JSON else 0)
+    )
+_JSON_INDENT = 2 if PRETTY_JSON else None
+_JSON_SEPARATORS = None if PRETTY_JSON else (",", ":")
+
 
 # ============================================================================
 # STATIC RESOURCE CONTENT
@@ -100,6 +126,76 @@ Defined in schema with from/to entity types:
 """
 
 
+def _compile_validator(schema: dict) -> Any:
+    """Build a reusable JSON Schema validator (schema checked once, up front)."""
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+def _dumps(obj: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits — let stdlib json handle it
+    # ensure_ascii=False keeps non-ASCII text as-is instead of \uXXXX escapes
+    return json.dumps(
+        obj, indent=_JSON_INDENT, separators=_JSON_SEPARATORS,
+        default=str, ensure_ascii=False,
+    )
+
+
+def _json_text(obj: Any) -> TextContent:
+    """Serialize a tool result once, straight into the text block MCP sends."""
+    return TextContent(type="text", text=_dumps(obj))
+
+
+@lru_cache(maxsize=32)
+def _make_annotations(
+    read_only: bool | None,
+    destructive: bool | None,
+    idempotent: bool | None,
+    open_world: bool | None,
+) -> ToolAnnotations:
+    """One shared ToolAnnotations per distinct combination of hints."""
+    return ToolAnnotations(
+        readOnlyHint=read_only,
+        destructiveHint=destructive,
+        idempotentHint=idempotent,
+        openWorldHint=open_world,
+    )
+
+
+def _build_tool(tool: dict) -> Tool:
+    annotations = None
+    if "annotations" in tool:
+        ann = tool["annotations"]
+        annotations = _make_annotations(
+            ann.get("readOnlyHint"),
+            ann.get("destructiveHint"),
+            ann.get("idempotentHint"),
+            ann.get("openWorldHint"),
+        )
+    return Tool(
+        name=tool["name"],
+        title=tool.get("title"),
+        description=tool["description"],
+        inputSchema=tool["inputSchema"],
+        annotations=annotations,
+    )
+
+
+def _doc_resource(uri: str) -> Resource:
+    name = uri.rpartition("/")[2].replace("-", " ").title()
+    return Resource(
+        uri=uri,
+        name=f"{name} Guide",
+        description=f"Documentation: {name}",
+        mimeType="text/markdown",
+    )
+
+
 def create_mcp_server(
     name: str,
     version: str,
@@ -124,6 +220,9 @@ class BaseMCPServer:
     Subclasses add: mode-specific tools and handlers.
     """
 
+    # HTTP mode: MCP requests with a larger body are rejected (None = no cap)
+    MAX_REQUEST_BYTES: int | None = None
+
     def __init__(
         self,
         name: str,
@@ -151,24 +250,42 @@ class BaseMCPServer:
         self.server = create_mcp_server(name, version, instructions)
 
         # Tools and handlers (set by subclass)
-        self._tools: list[dict] = []
+        self._tools: dict[str, Tool] = {}
+        self._tool_list: list[Tool] | None = None  # built on first tools/list
+        self._tool_validators: dict[str, Any] = {}
         self._tool_handlers: dict[str, Callable] = {}
+        self._wildcard_handler: Callable | None = None  # registered as "*"
         self._prompts: list[Prompt] = []
         self._prompt_handlers: dict[str, Callable] = {}
+        self._init_options: InitializationOptions | None = None
 
         # Resources
         self._static_resources: dict[str, str] = {
             "graforest://docs/getting-started": DOCS_GETTING_STARTED,
             "graforest://docs/knowledge-graph": DOCS_KNOWLEDGE_GRAPH,
         }
+        self._resources: list[Resource] = [
+            _doc_resource(uri) for uri in self._static_resources
+        ]
+        # Ready-made read_resource payloads — the SDK wraps them as-is
+        self._resource_contents: dict[str, tuple[ReadResourceContents, ...]] = {
+            uri: (ReadResourceContents(content=text, mime_type="text/markdown"),)
+            for uri, text in self._static_resources.items()
+        }
 
-    def register_tools(self, tools: list[dict]) -> None:
-        self._tools.extend(tools)
+    def register_tools(self, tools: Sequence[dict]) -> None:
+        for tool in tools:
+            self._tools[tool["name"]] = _build_tool(tool)
+            self._tool_validators[tool["name"]] = _compile_validator(tool["inputSchema"])
+        self._tool_list = None
 
     def register_tool_handler(self, name: str, handler: Callable) -> None:
-        self._tool_handlers[name] = handler
+        if name == "*":
+            self._wildcard_handler = handler
+        else:
+            self._tool_handlers[name] = handler
 
-    def register_prompts(self, prompts: list[Prompt]) -> None:
+    def register_prompts(self, prompts: Sequence[Prompt]) -> None:
         self._prompts.extend(prompts)
 
     def register_prompt_handler(self, name: str, handler: Callable) -> None:
@@ -183,43 +300,35 @@ class BaseMCPServer:
     def _setup_tool_handlers(self) -> None:
         @self.server.list_tools()
         async def list_tools() -> list[Tool]:
-            tools_list = []
-            for tool in self._tools:
-                annotations = None
-                if "annotations" in tool:
-                    ann = tool["annotations"]
-                    annotations = ToolAnnotations(
-                        readOnlyHint=ann.get("readOnlyHint"),
-                        destructiveHint=ann.get("destructiveHint"),
-                        idempotentHint=ann.get("idempotentHint"),
-                        openWorldHint=ann.get("openWorldHint"),
-                    )
-                tool_obj = Tool(
-                    name=tool["name"],
-                    title=tool.get("title"),
-                    description=tool["description"],
-                    inputSchema=tool["inputSchema"],
-                    annotations=annotations,
-                )
-                tools_list.append(tool_obj)
-            return tools_list
-
-        @self.server.call_tool()
-        async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-            valid_tools = [t["name"] for t in self._tools]
-            if name not in valid_tools:
+            if self._tool_list is None:
+                self._tool_list = list(self._tools.values())
+            return self._tool_list
+
+        # Input is validated here against validators compiled at registration,
+        # instead of the SDK re-checking the schema on every call
+        @self.server.call_tool(validate_input=False)
+        async def call_tool(name: str, arguments: dict) -> list[TextContent] | CallToolResult:
+            if name not in self._tools:
                 raise ValueError(f"Unknown tool: {name}")
 
-            handler = self._tool_handlers.get(name) or self._tool_handlers.get("*")
+            error = jsonschema.exceptions.best_match(
+                self._tool_validators[name].iter_errors(arguments)
+            )
+            if error is not None:
+                return CallToolResult(
+                    content=[TextContent(type="text", text=f"Input validation error: {error.message}")],
+                    isError=True,
+                )
+
+            handler = self._tool_handlers.get(name, self._wildcard_handler)
             if not handler:
                 raise ValueError(f"No handler registered for tool: {name}")
 
             try:
                 result = await handler(name, arguments)
-                formatted = json.dumps(result, indent=2, default=str)
-                return [TextContent(type="text", text=formatted)]
+                return [_json_text(result)]
             except Exception as e:
-                print(f"[graforest-mcp] Error in {name}: {e}", file=sys.stderr)
+                logger.error("[graforest-mcp] Error in %s: %s", name, e)
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
 
     def _setup_prompt_handlers(self) -> None:
@@ -237,23 +346,15 @@ class BaseMCPServer:
     def _setup_resource_handlers(self) -> None:
         @self.server.list_resources()
         async def list_resources() -> list[Resource]:
-            resources = []
-            for uri, _ in self._static_resources.items():
-                name = uri.split("/")[-1].replace("-", " ").title()
-                resources.append(Resource(
-                    uri=uri,
-                    name=f"{name} Guide",
-                    description=f"Documentation: {name}",
-                    mimeType="text/markdown",
-                ))
-            return resources
+            return self._resources
 
         @self.server.read_resource()
-        async def read_resource(uri) -> str:
+        async def read_resource(uri) -> tuple[ReadResourceContents, ...]:
             uri_str = str(uri)
-            if uri_str in self._static_resources:
-                return self._static_resources[uri_str]
-            raise ValueError(f"Unknown resource: {uri_str}")
+            contents = self._resource_contents.get(uri_str)
+            if contents is None:
+                raise ValueError(f"Unknown resource: {uri_str}")
+            return contents
 
     def get_api_key_for_request(self) -> str | None:
         """Get API key for current request.
@@ -267,23 +368,34 @@ class BaseMCPServer:
         if ctx is None:
             return None
 
-        request = getattr(ctx, "request", None)
-        if request is None or not isinstance(request, Request):
+        # Any request object with headers will do (Starlette in practice)
+        headers = getattr(getattr(ctx, "request", None), "headers", None)
+        if headers is None:
             return None
 
-        return extract_api_key_from_request(request)
+        return extract_api_key_from_headers(headers)
 
     def get_init_options(self) -> InitializationOptions:
-        return InitializationOptions(
-            server_name=self.name,
-            server_version=self.version,
-            capabilities=self.server.get_capabilities(
-                notification_options=NotificationOptions(),
-                experimental_capabilities={},
-            ),
-            instructions=self.instructions,
-            website_url="https://graforest.ai",
-        )
+        # Capabilities depend on the registered handlers, so build on first
+        # use (after setup_handlers) and reuse from then on
+        if self._init_options is None:
+            self._init_options = InitializationOptions(
+                server_name=self.name,
+                server_version=self.version,
+                capabilities=self.server.get_capabilities(
+                    notification_options=NotificationOptions(),
+                    experimental_capabilities={},
+                ),
+                instructions=self.instructions,
+                website_url="https://graforest.ai",
+            )
+        return self._init_options
+
+    async def close(self) -> None:
+        """Release resources held by the server (override in subclasses).
+
+        Called by the transport on the serving event loop at shutdown.
+        """
 
     def run(self, transport: str = "stdio") -> None:
         """Run the MCP server with specified transport."""
@@ -293,9 +405,12 @@ class BaseMCPServer:
                 name=self.name,
                 version=self.version,
                 description=self.instructions,
+                max_request_bytes=self.MAX_REQUEST_BYTES,
+                on_shutdown=self.close,
             )
         else:
             run_stdio(
                 server=self.server,
                 init_options=self.get_init_options(),
+                on_shutdown=self.close,
             )
@@ -13,16 +13,16 @@
 
 import asyncio
 import contextlib
+import json
 import os
 import sys
 from typing import Any, Callable
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable, Iterable
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.server.models import InitializationOptions
 from mcp.server.lowlevel.server import NotificationOptions
-from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 
 __all__ = [
     "run_stdio",
@@ -38,17 +38,34 @@ __all__ = [
 def run_stdio(
     server: Server,
     init_options: InitializationOptions,
+    on_shutdown: Callable[[], Awaitable[None]] | None = None,
 ) -> None:
-    """Run MCP server in STDIO mode for local IDEs."""
-    asyncio.run(_stdio_async(server, init_options))
+    """Run MCP server in STDIO mode for local IDEs.
+
+    on_shutdown is awaited on the serving event loop once the session ends.
+    """
+    coro = _stdio_async(server, init_options, on_shutdown)
+    # Optional faster event loop for this run only (no global loop policy) —
+    # stdlib asyncio loop otherwise
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(coro)
+    else:
+        uvloop.run(coro)
 
 
 async def _stdio_async(
     server: Server,
     init_options: InitializationOptions,
+    on_shutdown: Callable[[], Awaitable[None]] | None = None,
 ) -> None:
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, init_options)
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, init_options)
+    finally:
+        if on_shutdown is not None:
+            await on_shutdown()
 
 
 # ============================================================================
@@ -61,11 +78,16 @@ def run_http(
     version: str,
     description: str,
     server_card_builder: Callable[[], dict] | None = None,
+    max_request_bytes: int | None = None,
+    on_shutdown: Callable[[], Awaitable[None]] | None = None,
 ) -> None:
     """Run MCP server in HTTP mode for cloud deployment."""
     import uvicorn
 
-    app = create_http_app(server, name, version, description, server_card_builder)
+    app = create_http_app(
+        server, name, version, description, server_card_builder, max_request_bytes,
+        on_shutdown,
+    )
 
     port = int(os.environ.get("PORT", 8000))
     host = os.environ.get("HOST", "0.0.0.0")
@@ -75,6 +97,7 @@ def run_http(
     print(f"[graforest-mcp]   - http://{host}:{port}/sse (primary)", file=sys.stderr)
     print(f"[graforest-mcp]   - http://{host}:{port}/mcp (alternative)", file=sys.stderr)
 
+    # loop="auto" (uvicorn's default) already picks uvloop when installed
     uvicorn.run(app, host=host, port=port, log_level="info")
 
 
@@ -84,13 +107,18 @@ def create_http_app(
     version: str,
     description: str,
     server_card_builder: Callable[[], dict] | None = None,
+    max_request_bytes: int | None = None,
+    on_shutdown: Callable[[], Awaitable[None]] | None = None,
 ) -> Any:
-    """Create Starlette ASGI application for HTTP transport."""
+    """Create Starlette ASGI application for HTTP transport.
+
+    MCP requests whose body exceeds max_request_bytes (if set) get a 413.
+    on_shutdown is awaited in the app's lifespan, on the serving event loop.
+    """
     from starlette.applications import Starlette
-    from starlette.routing import Route, Mount
-    from starlette.responses import JSONResponse
-    from starlette.middleware.cors import CORSMiddleware
+    from starlette.routing import Mount
     from starlette.types import Receive, Scope, Send
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 
     session_manager = StreamableHTTPSessionManager(
         app=server,
@@ -98,29 +126,36 @@ def create_http_app(
         stateless=True,
     )
 
-    async def server_card(request):
-        if server_card_builder:
-            card = server_card_builder()
-        else:
-            card = _build_default_server_card(name, version, description)
-        return JSONResponse(card)
-
-    async def health(request):
-        return JSONResponse({"status": "ok", "version": version})
+    # Both bodies are static for the life of the app — encode them once
+    if server_card_builder:
+        card = server_card_builder()
+    else:
+        card = _build_default_server_card(name, version, description)
+    static_bodies = {
+        "/.well-known/mcp/server-card.json": _json_bytes(card),
+        "/health": _json_bytes({"status": "ok", "version": version}),
+    }
 
     async def handle_streamable(scope: Scope, receive: Receive, send: Send):
-        await session_manager.handle_request(scope, receive, send)
+        if max_request_bytes is None or scope["type"] != "http":
+            await session_manager.handle_request(scope, receive, send)
+        else:
+            await _call_with_body_limit(
+                session_manager.handle_request, scope, receive, send, max_request_bytes,
+            )
 
     @contextlib.asynccontextmanager
     async def lifespan(app: Starlette) -> AsyncIterator[None]:
-        async with session_manager.run():
-            yield
+        try:
+            async with session_manager.run():
+                yield
+        finally:
+            if on_shutdown is not None:
+                await on_shutdown()
 
     app = Starlette(
         debug=False,
         routes=[
-            Route("/.well-known/mcp/server-card.json", endpoint=server_card, methods=["GET"]),
-            Route("/health", endpoint=health, methods=["GET"]),
             Mount("/sse", app=handle_streamable),
             Mount("/mcp", app=handle_streamable),
             Mount("/", app=handle_streamable),
@@ -128,15 +163,216 @@ def create_http_app(
         lifespan=lifespan,
     )
 
-    app = CORSMiddleware(
-        app,
-        allow_origins=["*"],
-        allow_methods=["GET", "POST", "DELETE"],
-        allow_headers=["*"],
-        expose_headers=["Mcp-Session-Id"],
-    )
+    # Static endpoints are answered here, before Starlette's routing runs
+    async def app_with_static(scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            body = static_bodies.get(scope["path"])
+            if body is not None:
+                await _send_json(send, body)
+                return
+        await app(scope, receive, send)
+
+    return _OpenCORSMiddleware(app_with_static)
+
+
+async def _send_json(send: Any, body: bytes) -> None:
+    headers = [
+        (b"content-length", str(len(body)).encode()),
+        (b"content-type", b"application/json"),
+    ]
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_text(send: Any, status: int, body: bytes) -> None:
+    headers = [
+        (b"content-length", str(len(body)).encode()),
+        (b"content-type", b"text/plain; charset=utf-8"),
+    ]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _call_with_body_limit(
+    app: Callable[..., Any],
+    scope: Any,
+    receive: Any,
+    send: Any,
+    limit: int,
+) -> None:
+    """Run an ASGI app, answering 413 if the request body passes `limit` bytes.
+
+    A declared Content-Length is checked up front (400 if it isn't a valid
+    length). The body is then read here, counting the bytes actually
+    received so chunked bodies are held to the same limit, and handed to the
+    app in one message — the MCP transport buffers the whole body anyway.
+    """
+    for key, value in scope["headers"]:
+        if key == b"content-length":
+            try:
+                declared = int(value)
+            except ValueError:
+                declared = -1
+            if declared < 0:
+                await _send_text(send, 400, b"Invalid Content-Length header")
+                return
+            if declared > limit:
+                await _send_text(send, 413, b"Request body too large")
+                return
+            break
+
+    chunks: list[bytes] = []
+    received = 0
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            return  # client disconnected mid-body
+        chunk = message.get("body", b"")
+        received += len(chunk)
+        if received > limit:
+            await _send_text(send, 413, b"Request body too large")
+            return
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            break
+
+    body_message: dict | None = {
+        "type": "http.request", "body": b"".join(chunks), "more_body": False,
+    }
+
+    async def replay_receive() -> dict:
+        nonlocal body_message
+        if body_message is not None:
+            message, body_message = body_message, None
+            return message
+        return await receive()
+
+    await app(scope, replay_receive, send)
+
+
+# ============================================================================
+# CORS - Wide-open policy with static headers
+# ============================================================================
+
+_CORS_METHODS = ("GET", "POST", "DELETE")
+
+# Set on every response to a request carrying an Origin header (replacing any
+# value the app set); every response also gets Origin merged into Vary
+_CORS_HEADERS: list[tuple[bytes, bytes]] = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-expose-headers", b"Mcp-Session-Id"),
+]
+_CORS_HEADER_NAMES = frozenset(name for name, _ in _CORS_HEADERS)
+
+_PREFLIGHT_HEADERS: list[tuple[bytes, bytes]] = [
+    (b"vary", b"Origin, Access-Control-Request-Method, Access-Control-Request-Headers, "
+              b"Access-Control-Request-Private-Network"),
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-methods", ", ".join(_CORS_METHODS).encode()),
+    (b"access-control-max-age", b"600"),
+    (b"content-type", b"text/plain; charset=utf-8"),
+]
+
+
+def _add_cors_headers(
+    headers: Iterable[tuple[bytes, bytes]],
+    has_origin: bool,
+) -> list[tuple[bytes, bytes]]:
+    """Response headers with the CORS headers applied, as CORSMiddleware does.
+
+    Any Vary headers from the app are merged into one, with Origin appended.
+    """
+    out: list[tuple[bytes, bytes]] = []
+    vary: list[bytes] = []
+    vary_at = -1
+    for key, value in headers:
+        name = key.lower()
+        if name == b"vary":
+            if vary_at < 0:
+                vary_at = len(out)
+                out.append((b"vary", b""))  # placeholder, filled in below
+            vary.append(value)
+        elif not (has_origin and name in _CORS_HEADER_NAMES):
+            out.append((key, value))
+
+    if has_origin:
+        out.extend(_CORS_HEADERS)
+    vary.append(b"Origin")
+    if vary_at < 0:
+        out.append((b"vary", b"Origin"))
+    else:
+        out[vary_at] = (b"vary", b", ".join(vary))
+    return out
+
+
+class _OpenCORSMiddleware:
+    """Same policy as starlette's CORSMiddleware with allow_origins=["*"],
+    allow_headers=["*"] and no credentials — but every header is prebuilt,
+    so a request costs one scan of its headers and no origin matching.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        has_origin = False
+        request_method = request_headers = private_network = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                has_origin = True
+            elif key == b"access-control-request-method":
+                request_method = value
+            elif key == b"access-control-request-headers":
+                request_headers = value
+            elif key == b"access-control-request-private-network":
+                private_network = value
+
+        if has_origin and request_method is not None and scope["method"] == "OPTIONS":
+            await self._preflight(send, request_method, request_headers, private_network)
+            return
+
+        async def send_with_cors(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = _add_cors_headers(message.get("headers", ()), has_origin)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    @staticmethod
+    async def _preflight(
+        send: Any,
+        request_method: bytes,
+        request_headers: bytes | None,
+        private_network: bytes | None,
+    ) -> None:
+        headers = list(_PREFLIGHT_HEADERS)
+        # All headers are allowed, so mirror back whatever was asked for
+        if request_headers is not None:
+            headers.append((b"access-control-allow-headers", request_headers))
+
+        failures = []
+        if request_method.decode("latin-1") not in _CORS_METHODS:
+            failures.append("method")
+        if private_network is not None:
+            failures.append("private-network")
+
+        if failures:
+            status, body = 400, ("Disallowed CORS " + ", ".join(failures)).encode()
+        else:
+            status, body = 200, b"OK"
+        headers.append((b"content-length", str(len(body)).encode()))
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
 
-    return app
+def _json_bytes(obj: Any) -> bytes:
+    # Same compact encoding as starlette's JSONResponse
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 
 def _build_default_server_card(name: str, version: str, description: str) -> dict:
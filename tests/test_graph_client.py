@@ -0,0 +1,387 @@
+# ============================================================================
+# GRAFOREST MCP - GRAPH API CLIENT TESTS
+# ============================================================================
+# Copyright 2026 Graforest. All Rights Reserved.
+#
+# GraphClient against an in-process httpx.MockTransport — no network.
+# ============================================================================
+
+import asyncio
+import gc
+import json
+
+import httpx
+
+from graforest_mcp.backend.graph_client import (
+    BULK_SIZE_BOUNDS,
+    MAX_RETRY_DELAY,
+    GraphClient,
+    _AdaptiveLimiter,
+)
+
+TOKEN = "test-token"
+
+
+def make_client(handler, **kwargs) -> GraphClient:
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return GraphClient(http_client=http_client, **kwargs)
+
+
+def entities(entity_type: str, count: int) -> list[dict]:
+    return [
+        {"entity_type": entity_type, "entity_id": f"{entity_type}-{i}", "properties": {}}
+        for i in range(count)
+    ]
+
+
+def relationships(rel_type: str, count: int) -> list[dict]:
+    return [
+        {"rel_type": rel_type, "from_id": f"a-{i}", "to_id": f"b-{i}"}
+        for i in range(count)
+    ]
+
+
+# ============================================================================
+# READS
+# ============================================================================
+
+async def test_list_entities_normalizes_nodes():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/v1/nodes/article/"
+        assert request.url.params["limit"] == "2"
+        return httpx.Response(200, json=[
+            {"entity_id": "a1", "hierarchical_path": "Document:Article", "title": "x"},
+            {"entity_id": "a2", "hierarchical_path": "Document:Article", "title": "y"},
+        ])
+
+    client = make_client(handler)
+    nodes = await client.list_entities("proj", "staging", TOKEN, "Article", limit=2)
+    assert [n["id"] for n in nodes] == ["a1", "a2"]
+    assert nodes[0]["entity_type"] == "Article"
+    assert nodes[0]["properties"]["title"] == "x"
+
+
+async def loop_errors_after_traverse(traverse_response: httpx.Response) -> list[dict]:
+    """Run traverse while the relationships fetch fails as it is cancelled.
+
+    Returns what reached the event loop's exception handler afterwards.
+    """
+    errors: list[dict] = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda _loop, context: errors.append(context))
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/relationships"):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                # Cleanup interrupted by the cancel fails with its own error
+                raise httpx.ConnectError("connection reset", request=request)
+        await asyncio.sleep(0.01)  # let the relationships request get going
+        return traverse_response
+
+    client = make_client(handler)
+    try:
+        await client.traverse("proj", "staging", TOKEN, "Topic", "t1")
+    except httpx.HTTPStatusError:
+        pass
+    await asyncio.sleep(0.01)  # let the cancelled task unwind
+    gc.collect()
+    loop.set_exception_handler(None)
+    return errors
+
+
+async def test_traverse_empty_result_retrieves_rels_task_error():
+    response = httpx.Response(200, json={"connected_nodes": [], "max_depth": 3})
+    assert await loop_errors_after_traverse(response) == []
+
+
+async def test_traverse_error_retrieves_rels_task_error():
+    response = httpx.Response(500, json={"detail": "boom"})
+    assert await loop_errors_after_traverse(response) == []
+
+
+# ============================================================================
+# BULK FAN-OUT
+# ============================================================================
+
+async def test_bulk_create_entities_stops_batches_after_failure():
+    posts: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        posts.append(request.url.path)
+        if request.url.path.endswith("/bad"):
+            return httpx.Response(400, json={"detail": "invalid properties"})
+        await asyncio.sleep(0.01)
+        return httpx.Response(201, json={"created": 1})
+
+    client = make_client(handler, max_inflight=4)
+    try:
+        await client.bulk_create_entities(
+            "proj", "staging", TOKEN, entities("Bad", 1) + entities("Good", 100), bulk_size=1,
+        )
+    except RuntimeError as e:
+        assert "Bulk create Bad failed" in str(e)
+    else:
+        raise AssertionError("expected the failed batch to be raised")
+
+    sent = len(posts)
+    await asyncio.sleep(0.1)
+    assert len(posts) == sent < 101
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+async def test_bulk_create_relationships_stops_batches_after_failure():
+    posts: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        posts.append(request.url.path)
+        if request.url.path.endswith("/bad_rel"):
+            return httpx.Response(400, json={"detail": "unknown endpoint node"})
+        await asyncio.sleep(0.01)
+        return httpx.Response(201, json={"created": 1})
+
+    client = make_client(handler, max_inflight=4)
+    try:
+        await client.bulk_create_relationships(
+            "proj", "staging", TOKEN,
+            relationships("BAD_REL", 1) + relationships("GOOD_REL", 100),
+            bulk_size=1,
+        )
+    except RuntimeError as e:
+        assert "Bulk create BAD_REL failed" in str(e)
+    else:
+        raise AssertionError("expected the failed batch to be raised")
+
+    sent = len(posts)
+    await asyncio.sleep(0.1)
+    assert len(posts) == sent < 101
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+async def test_bulk_create_sums_counts_per_type():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(201, json={"created": 2})
+
+    client = make_client(handler)
+    result = await client.bulk_create_entities(
+        "proj", "staging", TOKEN, entities("A", 6) + entities("B", 2), bulk_size=2,
+    )
+    assert result == {"A": 6, "B": 2}
+
+
+async def test_bulk_body_is_compact_row_json():
+    bodies: list[bytes] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        return httpx.Response(201, json={"created": 1})
+
+    client = make_client(handler)
+    await client.bulk_create_entities("proj", "staging", TOKEN, [
+        {"entity_type": "Topic", "entity_id": "t1", "properties": {"name": "Café"}},
+    ])
+    assert json.loads(bodies[0]) == {"nodes": [{"entity_id": "t1", "data": {"name": "Café"}}]}
+    assert b" " not in bodies[0]
+
+
+# ============================================================================
+# COLUMNAR FORMAT
+# ============================================================================
+
+def columnar_handler(columnar_response: httpx.Response, requests: list[httpx.Request]):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.params.get("format") == "columnar":
+            return columnar_response
+        return httpx.Response(201, json={"created": 1})
+    return handler
+
+
+async def test_columnar_falls_back_to_rows_on_415():
+    requests: list[httpx.Request] = []
+    client = make_client(
+        columnar_handler(httpx.Response(415, text="Unsupported Media Type"), requests),
+        columnar=True,
+    )
+    assert await client.bulk_create_entities("proj", "staging", TOKEN, entities("A", 1)) == {"A": 1}
+    assert [r.url.params.get("format") for r in requests] == ["columnar", None]
+    assert client.columnar is False
+
+
+async def test_columnar_falls_back_on_400_naming_the_format():
+    requests: list[httpx.Request] = []
+    client = make_client(
+        columnar_handler(httpx.Response(400, json={"detail": "format=columnar not supported"}), requests),
+        columnar=True,
+    )
+    await client.bulk_create_entities("proj", "staging", TOKEN, entities("A", 1))
+    assert len(requests) == 2
+    assert client.columnar is False
+
+
+async def test_columnar_data_error_is_raised_and_keeps_columnar():
+    requests: list[httpx.Request] = []
+    client = make_client(
+        columnar_handler(httpx.Response(400, json={"detail": "name: field required"}), requests),
+        columnar=True,
+    )
+    try:
+        await client.bulk_create_entities("proj", "staging", TOKEN, entities("A", 1))
+    except RuntimeError as e:
+        assert "400" in str(e)
+    else:
+        raise AssertionError("expected the 400 to be raised")
+    assert len(requests) == 1
+    assert client.columnar is True
+
+
+# ============================================================================
+# BACKPRESSURE - AIMD limiter, retries, batch size
+# ============================================================================
+
+def test_limiter_halves_after_three_consecutive_429s():
+    limiter = _AdaptiveLimiter(16)
+    for _ in range(2):
+        limiter.record(429)
+    assert limiter.limit == 16
+    limiter.record(429)
+    assert limiter.limit == 8
+    for _ in range(30):
+        limiter.record(429)
+    assert limiter.limit == 2  # floor
+
+
+def test_limiter_grows_by_one_per_20_successes_up_to_max():
+    limiter = _AdaptiveLimiter(8)
+    for _ in range(3):
+        limiter.record(429)
+    assert limiter.limit == 4
+    for _ in range(19):
+        limiter.record(201)
+    assert limiter.limit == 4
+    limiter.record(201)
+    assert limiter.limit == 5
+    for _ in range(200):
+        limiter.record(200)
+    assert limiter.limit == 8  # never above the configured ceiling
+
+
+def test_limiter_streaks_reset_on_the_other_outcome():
+    limiter = _AdaptiveLimiter(16)
+    for _ in range(10):
+        limiter.record(429)
+        limiter.record(429)
+        limiter.record(200)
+    assert limiter.limit == 16
+    limiter = _AdaptiveLimiter(8)
+    for _ in range(3):
+        limiter.record(429)
+    for _ in range(10):
+        for _ in range(19):
+            limiter.record(200)
+        limiter.record(429)
+    assert limiter.limit == 4
+
+
+async def test_limiter_caps_concurrency():
+    limiter = _AdaptiveLimiter(3)
+    active = peak = 0
+
+    async def work():
+        nonlocal active, peak
+        async with limiter:
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(work() for _ in range(12)))
+    assert peak == 3
+
+
+def test_retry_delay_honors_retry_after_capped():
+    assert GraphClient._retry_delay(httpx.Response(429, headers={"Retry-After": "7"}), 0) == 7.0
+    assert GraphClient._retry_delay(httpx.Response(429, headers={"Retry-After": "0"}), 3) == 0.0
+    assert GraphClient._retry_delay(
+        httpx.Response(503, headers={"Retry-After": "3600"}), 0,
+    ) == MAX_RETRY_DELAY
+
+
+def test_retry_delay_backs_off_exponentially_without_retry_after():
+    # HTTP-date Retry-After isn't parsed — falls back to backoff + jitter
+    date = httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"})
+    for attempt, base in [(0, 0.5), (1, 1.0), (3, 4.0), (10, MAX_RETRY_DELAY)]:
+        for resp in (httpx.Response(502), date):
+            delay = GraphClient._retry_delay(resp, attempt)
+            assert base <= delay <= base + 0.25
+
+
+async def test_send_batch_retries_transient_statuses():
+    statuses = iter([429, 503, 201])
+    posts = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal posts
+        posts += 1
+        status = next(statuses)
+        if status == 201:
+            return httpx.Response(201, json={"created": 1})
+        return httpx.Response(status, headers={"Retry-After": "0"})
+
+    client = make_client(handler)
+    assert await client.bulk_create_entities("proj", "staging", TOKEN, entities("A", 1)) == {"A": 1}
+    assert posts == 3
+
+
+async def test_send_batch_gives_up_after_max_retries():
+    posts = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal posts
+        posts += 1
+        return httpx.Response(429, headers={"Retry-After": "0"})
+
+    client = make_client(handler, max_retries=2)
+    try:
+        await client.bulk_create_entities("proj", "staging", TOKEN, entities("A", 1))
+    except RuntimeError as e:
+        assert "429" in str(e)
+    else:
+        raise AssertionError("expected the last 429 to be raised")
+    assert posts == 3
+    assert client._inflight.limit == client._inflight.max_limit // 2
+
+
+async def test_bulk_size_grows_on_fast_batches_and_stays_in_bounds():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(201, json={"created": 1})
+
+    client = make_client(handler)
+    start = client._bulk_size
+    await client.bulk_create_entities("proj", "staging", TOKEN, entities("A", 1))
+    assert client._bulk_size == int(start * 1.5)
+
+    high = BULK_SIZE_BOUNDS[1]
+    for _ in range(50):
+        client._tune_bulk_size()
+    assert client._bulk_size == high
+
+
+def test_bulk_size_shrinks_on_slow_batches_and_stays_in_bounds():
+    client = GraphClient(http_client=httpx.AsyncClient())
+    client._tune_bulk_size()  # no latency observed yet — unchanged
+    start = client._bulk_size
+    client._record_batch_latency(1.0)
+    client._tune_bulk_size()
+    assert client._bulk_size == start  # between the thresholds
+
+    for _ in range(40):
+        client._record_batch_latency(10.0)
+    client._tune_bulk_size()
+    assert client._bulk_size == int(start * 0.75)
+
+    low = BULK_SIZE_BOUNDS[0]
+    for _ in range(50):
+        client._tune_bulk_size()
+    assert client._bulk_size == low
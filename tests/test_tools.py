@@ -0,0 +1,39 @@
+# ============================================================================
+# GRAFOREST MCP - TOOL HELPER TESTS
+# ============================================================================
+# Copyright 2026 Graforest. All Rights Reserved.
+#
+# HTML → text extraction for fetch_url_content, on both the lexbor path
+# (selectolax installed) and the regex fallback.
+# ============================================================================
+
+import pytest
+
+from graforest_mcp.backend import tools
+from graforest_mcp.backend.tools import GraforestMCPServer
+
+HTML_FIXTURES = [
+    ("<p>Fish &amp; chips &lt;b&gt; caf&eacute; x&#39;s</p>", "Fish & chips <b> café x's"),
+    ("<p>a</p><script>var x = '<p>no</p>';</script><p>b</p>", "a b"),
+    ("<style>p { color: red }</style>x<STYLE type='text/css'>q{}</STYLE>z", "x z"),
+    ("<textarea><b>raw</b></textarea>", "raw"),
+    ("<p>x</p><textarea name='t'>a &amp; <i>b</i></textarea><p>y</p>", "x a & b y"),
+    ("<html><head><title>T &amp; <b>U</b></title></head><body>Body</body></html>", "T & U Body"),
+    ("<!DOCTYPE html><h1>Head&nbsp;line</h1><!-- c --><ul><li>one</li><li>two</li></ul>", "Head line one two"),
+    ("plain text", "plain text"),
+    ("", ""),
+]
+
+
+@pytest.fixture(params=["lexbor", "regex"])
+def html_to_text(request, monkeypatch):
+    if request.param == "lexbor":
+        pytest.importorskip("selectolax.lexbor")
+    else:
+        monkeypatch.setattr(tools, "LexborHTMLParser", None)
+    return GraforestMCPServer._html_to_text
+
+
+@pytest.mark.parametrize(("html", "expected"), HTML_FIXTURES)
+def test_html_to_text(html_to_text, html, expected):
+    assert html_to_text(html) == expected
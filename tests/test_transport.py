@@ -0,0 +1,152 @@
+# ============================================================================
+# GRAFOREST MCP - HTTP TRANSPORT TESTS
+# ============================================================================
+# Copyright 2026 Graforest. All Rights Reserved.
+#
+# Raw ASGI pieces of the HTTP transport, driven with starlette's TestClient.
+# ============================================================================
+
+import json
+
+import pytest
+from mcp.server.lowlevel import Server
+from starlette.middleware.cors import CORSMiddleware
+from starlette.testclient import TestClient
+
+from graforest_mcp.core.transport import _OpenCORSMiddleware, create_http_app
+
+# ============================================================================
+# REQUEST SIZE LIMIT
+# ============================================================================
+
+LIMIT = 2048
+MCP_HEADERS = {
+    "accept": "application/json, text/event-stream",
+    "content-type": "application/json",
+}
+
+
+def initialize_body(padding: int = 0) -> bytes:
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-03-26",
+            "capabilities": {},
+            "clientInfo": {"name": "test" + "x" * padding, "version": "1.0"},
+        },
+    }).encode()
+
+
+@pytest.fixture(scope="module")
+def limited_client():
+    app = create_http_app(Server("test"), "test", "1.0", "test", max_request_bytes=LIMIT)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_body_under_limit_reaches_the_mcp_app(limited_client):
+    resp = limited_client.post("/mcp/", content=initialize_body(), headers=MCP_HEADERS)
+    assert resp.status_code == 200
+    assert resp.json()["result"]["serverInfo"]["name"] == "test"
+
+
+def test_chunked_body_is_replayed_whole(limited_client):
+    body = initialize_body(padding=1500)
+    assert len(body) < LIMIT
+    chunks = iter([body[:100], body[100:700], body[700:]])
+    resp = limited_client.post("/mcp/", content=chunks, headers=MCP_HEADERS)
+    assert resp.status_code == 200
+    assert resp.json()["id"] == 1
+
+
+def test_declared_length_over_limit_is_413(limited_client):
+    resp = limited_client.post(
+        "/mcp/", content=b"{}", headers={**MCP_HEADERS, "content-length": str(LIMIT + 1)},
+    )
+    assert resp.status_code == 413
+
+
+def test_chunked_body_over_limit_is_413(limited_client):
+    chunks = iter([b" " * 1500, b" " * 1500])  # no Content-Length
+    resp = limited_client.post("/mcp/", content=chunks, headers=MCP_HEADERS)
+    assert resp.status_code == 413
+    assert resp.text == "Request body too large"
+
+
+@pytest.mark.parametrize("value", ["abc", "-3", ""])
+def test_invalid_content_length_is_400(limited_client, value):
+    resp = limited_client.post("/mcp/", content=b"{}", headers={**MCP_HEADERS, "content-length": value})
+    assert resp.status_code == 400
+    assert resp.text == "Invalid Content-Length header"
+
+
+def test_no_limit_passes_large_bodies_through():
+    app = create_http_app(Server("test"), "test", "1.0", "test")
+    with TestClient(app) as client:
+        resp = client.post("/mcp/", content=initialize_body(padding=LIMIT * 2), headers=MCP_HEADERS)
+    assert resp.status_code == 200
+
+# ============================================================================
+# CORS - must match starlette's CORSMiddleware with the same policy
+# ============================================================================
+
+_APP_HEADERS = {
+    "/plain": [],
+    "/vary": [(b"vary", b"Accept-Encoding")],
+    "/vary-twice": [(b"vary", b"Accept"), (b"vary", b"Cookie")],
+    "/own-origin": [(b"access-control-allow-origin", b"https://app.example")],
+}
+
+
+async def _app(scope, receive, send):
+    headers = _APP_HEADERS[scope["path"]] + [(b"content-type", b"text/plain")]
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+@pytest.fixture(scope="module")
+def cors_clients():
+    reference = CORSMiddleware(
+        _app,
+        allow_origins=["*"],
+        allow_methods=["GET", "POST", "DELETE"],
+        allow_headers=["*"],
+        expose_headers=["Mcp-Session-Id"],
+    )
+    return TestClient(_OpenCORSMiddleware(_app)), TestClient(reference)
+
+
+CORS_CASES = [
+    # Simple requests, with and without an Origin, against app-set headers
+    *[("GET", path, {}) for path in _APP_HEADERS],
+    *[("POST", path, {"Origin": "https://client.example"}) for path in _APP_HEADERS],
+    # Preflights
+    ("OPTIONS", "/plain", {
+        "Origin": "https://client.example",
+        "Access-Control-Request-Method": "POST",
+    }),
+    ("OPTIONS", "/plain", {
+        "Origin": "https://client.example",
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "content-type, mcp-session-id",
+    }),
+    ("OPTIONS", "/plain", {
+        "Origin": "https://client.example",
+        "Access-Control-Request-Method": "PUT",
+    }),
+    # Not a preflight: no Origin, or no requested method
+    ("OPTIONS", "/vary", {"Access-Control-Request-Method": "POST"}),
+    ("OPTIONS", "/vary", {"Origin": "https://client.example"}),
+]
+
+
+@pytest.mark.parametrize(("method", "path", "headers"), CORS_CASES)
+def test_cors_matches_starlette(cors_clients, method, path, headers):
+    ours, reference = cors_clients
+    got = ours.request(method, path, headers=headers)
+    want = reference.request(method, path, headers=headers)
+    assert got.status_code == want.status_code
+    assert got.content == want.content
+    assert sorted(got.headers.multi_items()) == sorted(want.headers.multi_items())